@@ -1,4 +1,4 @@
-from cache import redis
+from cache import facts
 from .absctract.tokens import ERC20
 from .account import SimpleAccount
 from ..contracts.account_factory import SympleAccountFactory
@@ -6,10 +6,11 @@ from ..provider import provider
 
 
 def get_account_factory() -> SympleAccountFactory:
+    address, chain_id = facts.config_many("simple_account_factory", "chain_id")
     return SympleAccountFactory(
         w3=provider,
-        address=redis.get("simple_account_factory"),
-        chain_id=redis.get("chain_id")
+        address=address,
+        chain_id=chain_id
     )
 
 
@@ -19,13 +20,14 @@ def get_account(
     return SimpleAccount(
         w3=provider,
         address=address,
-        chain_id=redis.get("chain_id")
+        chain_id=facts.config("chain_id")
     )
 
 
 def get_rub() -> ERC20:
+    address, chain_id = facts.config_many("rub_address", "chain_id")
     return ERC20(
         w3=provider,
-        address=redis.get("rub_address"),
-        chain_id=redis.get("chain_id")
+        address=address,
+        chain_id=chain_id
     )
@@ -146,6 +146,30 @@ abi = '''[
       "stateMutability": "nonpayable",
       "type": "function"
     },
+    {
+      "inputs": [
+        {
+          "internalType": "address[]",
+          "name": "_signers",
+          "type": "address[]"
+        },
+        {
+          "internalType": "address[]",
+          "name": "_recovery_signers",
+          "type": "address[]"
+        }
+      ],
+      "name": "createAccounts",
+      "outputs": [
+        {
+          "internalType": "contract SimpleAccount[]",
+          "name": "accounts",
+          "type": "address[]"
+        }
+      ],
+      "stateMutability": "nonpayable",
+      "type": "function"
+    },
     {
       "inputs": [
         {
@@ -1,5 +1,18 @@
+from functools import cached_property
+from typing import Any, Optional, Sequence
+
 from eth_typing import ChecksumAddress
+from hexbytes import HexBytes
 from web3 import AsyncWeb3
+from web3.contract import AsyncContract as Web3AsyncContract
+from web3.contract.async_contract import AsyncContractEvents
+
+from blockchain.eth.utils.encoders import BoundCall, get_contract_abi
+from blockchain.eth.utils.gas_estimator import get_gas_estimator
+from blockchain.eth.utils.multicall import CallResult, get_batch_reader
+from blockchain.eth.utils.relayer_pool import get_relayer_pool
+from blockchain.eth.utils.simulator import get_simulator
+from blockchain.eth.utils.web3_extentions import build_tx, sign_txn_and_send
 
 
 class AsyncContract(object):
@@ -12,6 +25,75 @@ class AsyncContract(object):
     ):
         self._w3: AsyncWeb3 = w3
         self.address: ChecksumAddress = w3.to_checksum_address(address)
-        self._contract = w3.eth.contract(self.address, abi=abi)
-        self._functions = self._contract.functions
+        # parsed once per ABI, calls are encoded without building a web3 contract
+        self._abi = get_contract_abi(abi)
         self.chain_id = chain_id
+
+    @cached_property
+    def _contract(self) -> Web3AsyncContract:
+        """
+        Full web3 contract, only built for event processing
+        """
+        return self._w3.eth.contract(self.address, abi=self._abi.abi)
+
+    @property
+    def events(self) -> AsyncContractEvents:
+        """
+        Events of the contract, to decode logs and receipts
+        """
+        return self._contract.events
+
+    def function(self, fn_name: str, *args: Any) -> BoundCall:
+        """
+        Bound view call that can be passed to `read_many` together with calls to other contracts
+        """
+        return BoundCall(self.address, self._abi[fn_name], args)
+
+    async def read_many(self, calls: Sequence[BoundCall], block_identifier="latest") -> list[CallResult]:
+        return await get_batch_reader(self._w3).read(calls, block_identifier)
+
+    async def _call(self, fn_name: str, *args: Any, block_identifier="latest") -> Any:
+        function = self._abi[fn_name]
+        data = await self._w3.eth.call({"to": self.address, "data": function.encode(args)}, block_identifier)
+        return function.decode(data)
+
+    async def _send(
+        self,
+        fn_name: str,
+        args: Sequence[Any],
+        private_key: Optional[str] = None,
+        value: int = 0,
+        simulate: bool = True,
+    ) -> HexBytes:
+        """
+        Sends from `private_key`, or from the least loaded relayer of the pool when it is not given
+        """
+        if private_key is None:
+            async with get_relayer_pool(self._w3).acquire() as relayer:
+                return await self._send(fn_name, args, relayer.key, value, simulate)
+
+        account = self._w3.eth.account.from_key(private_key)
+        call = {
+            "from": account.address,
+            "to": self.address,
+            "data": self._abi.encode(fn_name, args),
+            "value": value,
+        }
+        # simulated and estimated before build_tx so a reverting call does not take a nonce
+        if simulate:
+            await get_simulator(self._w3).simulate(call, self._abi)
+        gas = await get_gas_estimator(self._w3).estimate(call)
+        tx = await build_tx(
+            w3=self._w3,
+            from_address=account.address,
+            gas=gas,
+            chain_id=self.chain_id,
+        )
+        tx.update(call)
+
+        send_tx = await sign_txn_and_send(
+            w3=self._w3,
+            transaction=tx,
+            private_key=account.key,
+        )
+        return send_tx
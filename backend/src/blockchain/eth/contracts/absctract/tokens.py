@@ -1,5 +1,6 @@
 from decimal import Decimal, localcontext
-from typing import Union
+from functools import partial
+from typing import Optional, Sequence, Union
 
 from eth_typing import HexAddress
 from eth_utils import is_string, is_integer
@@ -7,7 +8,7 @@ from eth_utils.currency import MIN_WEI, MAX_WEI
 from hexbytes import HexBytes
 from web3 import AsyncWeb3
 
-from blockchain.eth.utils.web3_extentions import build_tx, sign_txn_and_send
+from cache import facts
 from .contracts import AsyncContract
 from ..abis.tokens import abi as abi_erc20
 
@@ -50,10 +51,11 @@ def to_wei_from_decimals(number: Union[int, float, str, Decimal], decimals: int)
 
 
 class Token(AsyncContract):
-    def balance_of(self, address: str) -> int:
-        balance: int = self._functions.balanceOf(
+    async def balance_of(self, address: str) -> int:
+        balance: int = await self._call(
+            "balanceOf",
             self._w3.to_checksum_address(address)
-        ).call()
+        )
         return balance
 
 
@@ -62,7 +64,7 @@ class ERC20(Token):
         super().__init__(w3, address, abi, chain_id)
 
     async def decimals(self) -> int:
-        return await self._functions.decimals().call()
+        return await facts.get(f"decimals:{self.address}", partial(self._call, "decimals"))
 
     async def to_decimals(self, amount: Union[int, float, Decimal]) -> int:
         return to_wei_from_decimals(amount, await self.decimals())
@@ -75,58 +77,50 @@ class ERC20(Token):
         to_address: Union[HexAddress, str],
         amount: int,
         private_key: str,
+        simulate: bool = True,
     ) -> HexBytes:
-        account = self._w3.eth.account.from_key(private_key)
-        tx = await build_tx(
-            w3=self._w3,
-            from_address=account.address,
-            gas=100000,
-            chain_id=self.chain_id
-        )
-        transaction_made = await self._functions.transfer(
-            self._w3.to_checksum_address(to_address), amount
-        ).build_transaction(tx)
-
-        send_tx = await sign_txn_and_send(
-            w3=self._w3,
-            transaction=transaction_made,
-            private_key=account.key,
+        return await self._send(
+            "transfer",
+            [self._w3.to_checksum_address(to_address), amount],
+            private_key,
+            simulate=simulate,
         )
-        return send_tx
 
     async def balance_of(self, address: str, raw: bool = True) -> Union[int, Decimal]:
-        balance = await self._functions.balanceOf(
+        balance = await self._call(
+            "balanceOf",
             self._w3.to_checksum_address(address)
-        ).call()
+        )
         return balance if raw else await self.from_decimals(balance)
 
+    async def balances_of(self, addresses: Sequence[str], block_identifier="latest") -> list[Optional[int]]:
+        """
+        Raw balances of many holders in batched multicalls, None where the call failed
+        """
+        results = await self.read_many(
+            [self.function("balanceOf", self._w3.to_checksum_address(address)) for address in addresses],
+            block_identifier,
+        )
+        return [result.value if result.success else None for result in results]
+
     async def allowance(self, owner: str, spender: str) -> int:
-        amount = await self._functions.allowance(
+        amount = await self._call(
+            "allowance",
             self._w3.to_checksum_address(owner),
             self._w3.to_checksum_address(spender),
-        ).call()
+        )
         return amount
 
     async def approve(
         self,
         to_address: Union[HexAddress, str],
         amount: int,
-        private_key: str
+        private_key: str,
+        simulate: bool = True,
     ) -> HexBytes:
-        account = self._w3.eth.account.from_key(private_key)
-        tx = await build_tx(
-            w3=self._w3,
-            from_address=account.address,
-            gas=100000,
-            chain_id=self.chain_id
-        )
-        transaction_made = await self._functions.approve(
-            self._w3.to_checksum_address(to_address), amount
-        ).build_transaction(tx)
-
-        send_tx = await sign_txn_and_send(
-            w3=self._w3,
-            transaction=transaction_made,
-            private_key=account.key,
+        return await self._send(
+            "approve",
+            [self._w3.to_checksum_address(to_address), amount],
+            private_key,
+            simulate=simulate,
         )
-        return send_tx
@@ -1,10 +1,44 @@
+import re
+from typing import Iterable, Optional, Sequence, Union
+
+from eth_abi import encode
 from eth_typing import ChecksumAddress
+from eth_utils import function_signature_to_4byte_selector, keccak, to_checksum_address
 from hexbytes import HexBytes
 from web3 import AsyncWeb3
+from web3.logs import DISCARD
+from web3.types import EventData, TxReceipt
 
+from cache import facts
 from .abis.account_factory import abi as account_factory_abi
 from .absctract.contracts import AsyncContract
-from ..utils.web3_extentions import build_tx, sign_txn_and_send
+
+
+INITIALIZE_SELECTOR = function_signature_to_4byte_selector("initialize(address,address)")
+CREATION_CODE_PREFIX = bytes.fromhex("6080604052")
+# solc CBOR metadata: {"ipfs": <34 bytes>, "solc": <3 bytes>} followed by its length 0x0033
+METADATA_PATTERN = re.compile(rb"\xa2\x64ipfs\x58\x22.{34}\x64solc\x43.{3}\x00\x33", re.DOTALL)
+
+
+def create2_address(deployer: str, salt: Union[int, bytes], init_code_hash: bytes) -> ChecksumAddress:
+    if isinstance(salt, int):
+        salt = salt.to_bytes(32, "big")
+    return to_checksum_address(
+        keccak(b"\xff" + HexBytes(deployer) + salt + init_code_hash)[12:]
+    )
+
+
+def find_creation_codes(runtime_code: bytes) -> Iterable[bytes]:
+    """
+    Yields contract creation codes embedded into a runtime bytecode (`type(C).creationCode`, `new C()`)
+    """
+    start = runtime_code.find(CREATION_CODE_PREFIX, 1)
+    while start != -1:
+        metadata = METADATA_PATTERN.search(runtime_code, start)
+        if metadata is None:
+            return
+        yield runtime_code[start:metadata.end()]
+        start = runtime_code.find(CREATION_CODE_PREFIX, start + 1)
 
 
 class SympleAccountFactory(AsyncContract):
@@ -21,37 +55,61 @@ class SympleAccountFactory(AsyncContract):
         self,
         signer: str,
         recovery_signer: str,
-        private_key: str,
+        private_key: Optional[str] = None,
+        simulate: bool = True,
     ) -> HexBytes:
-        account = self._w3.eth.account.from_key(private_key)
-        tx = await build_tx(
-            w3=self._w3,
-            from_address=account.address,
-            gas=1000000,
-            chain_id=self.chain_id,
+        return await self._send(
+            "createAccount",
+            [
+                self._w3.to_checksum_address(signer),
+                self._w3.to_checksum_address(recovery_signer),
+            ],
+            private_key,
+            simulate=simulate,
         )
-        transaction_made = await self._functions.createAccount(
-            self._w3.to_checksum_address(signer),
-            self._w3.to_checksum_address(recovery_signer)
-        ).build_transaction(tx)
 
-        send_tx = await sign_txn_and_send(
-            w3=self._w3,
-            transaction=transaction_made,
-            private_key=account.key,
+    async def create_accounts(
+        self,
+        users: list[tuple[str, str]],
+        private_key: Optional[str] = None,
+        simulate: bool = True,
+    ) -> HexBytes:
+        """
+        Deploys accounts for all (signer, recovery_signer) pairs in a single transaction
+        """
+        return await self._send(
+            "createAccounts",
+            [
+                [self._w3.to_checksum_address(signer) for signer, _ in users],
+                [self._w3.to_checksum_address(recovery_signer) for _, recovery_signer in users],
+            ],
+            private_key,
+            simulate=simulate,
         )
-        return send_tx
 
     async def get_user_by_contract(self, contract: str) -> ChecksumAddress:
-        return await self._functions.getUserByContract(
+        return await self._call(
+            "getUserByContract",
             self._w3.to_checksum_address(contract)
-        ).call()
+        )
 
     async def get_user_by_signer(self, signer: str) -> tuple[ChecksumAddress, ChecksumAddress, ChecksumAddress]:
-        return await self._functions.getUserBySigner(
+        return await self._call(
+            "getUserBySigner",
             self._w3.to_checksum_address(signer)
-        ).call()
+        )
 
+    async def get_users_by_signers(
+        self,
+        signers: Sequence[str],
+    ) -> list[Optional[tuple[ChecksumAddress, ChecksumAddress, ChecksumAddress]]]:
+        """
+        getUserBySigner for many signers in one multicall, None where the call failed
+        """
+        results = await self.read_many(
+            [self.function("getUserBySigner", self._w3.to_checksum_address(signer)) for signer in signers]
+        )
+        return [result.value if result.success else None for result in results]
 
     async def get_address(
         self,
@@ -59,8 +117,91 @@ class SympleAccountFactory(AsyncContract):
         recovery_signer: str,
         counter: int
     ):
-        return await self._functions.getAddress(
+        return await self._call(
+            "getAddress",
             self._w3.to_checksum_address(signer),
             self._w3.to_checksum_address(recovery_signer),
             counter
-        ).call()
+        )
+
+    async def counter(self) -> int:
+        return await self._call("counter")
+
+    def get_account_initialized(self, receipt: TxReceipt) -> tuple[EventData, ...]:
+        """
+        AccountInitialized events emitted by this factory, logs of other contracts with the same topic are skipped
+        """
+        events = self.events.AccountInitialized().process_receipt(receipt, errors=DISCARD)
+        return tuple(event for event in events if event["address"] == self.address)
+
+    async def get_proxy_params(self) -> tuple[ChecksumAddress, bytes]:
+        implementation, creation_code = await facts.get(f"account_factory:{self.address}", self._load_proxy_params)
+        return implementation, bytes.fromhex(creation_code)
+
+    async def _load_proxy_params(self) -> tuple[ChecksumAddress, str]:
+        implementation = await self._call("accountImplementation")
+        signer, recovery_signer = "0x" + "11" * 20, "0x" + "22" * 20
+        expected = await self.get_address(signer, recovery_signer, 0)
+        for creation_code in find_creation_codes(await self._w3.eth.get_code(self.address)):
+            init_code_hash = self._init_code_hash(implementation, creation_code, signer, recovery_signer)
+            if create2_address(self.address, 0, init_code_hash) == expected:
+                return implementation, creation_code.hex()
+        raise ValueError(f"ERC1967Proxy creation code not found in factory {self.address}")
+
+    @staticmethod
+    def _init_code_hash(
+        implementation: str,
+        creation_code: bytes,
+        signer: str,
+        recovery_signer: str,
+    ) -> bytes:
+        init_data = INITIALIZE_SELECTOR + encode(["address", "address"], [signer, recovery_signer])
+        return keccak(creation_code + encode(["address", "bytes"], [implementation, init_data]))
+
+    async def compute_address(
+        self,
+        signer: str,
+        recovery_signer: str,
+        counter: int,
+    ) -> ChecksumAddress:
+        """
+        Offline equivalent of `getAddress`
+        """
+        return (await self.compute_addresses([(signer, recovery_signer, counter)]))[0]
+
+    async def compute_addresses(
+        self,
+        users: Iterable[tuple[str, str, int]],
+    ) -> list[ChecksumAddress]:
+        implementation, creation_code = await self.get_proxy_params()
+        return [
+            create2_address(
+                self.address,
+                counter,
+                self._init_code_hash(
+                    implementation,
+                    creation_code,
+                    self._w3.to_checksum_address(signer),
+                    self._w3.to_checksum_address(recovery_signer),
+                ),
+            )
+            for signer, recovery_signer, counter in users
+        ]
+
+    async def compute_addresses_from_receipt(
+        self,
+        receipt: TxReceipt,
+    ) -> list[tuple[ChecksumAddress, ChecksumAddress, ChecksumAddress]]:
+        """
+        Returns (signer, recovery_signer, contract_address) for every account deployed by the transaction
+        """
+        users = [
+            (event["args"]["signer"], event["args"]["recovery_signer"], event["args"]["_id"])
+            for event in self.get_account_initialized(receipt)
+        ]
+        addresses = await self.compute_addresses(users)
+        return [(signer, recovery_signer, address) for (signer, recovery_signer, _), address in zip(users, addresses)]
+
+    async def compute_address_from_receipt(self, receipt: TxReceipt) -> Optional[ChecksumAddress]:
+        accounts = await self.compute_addresses_from_receipt(receipt)
+        return accounts[0][2] if accounts else None
@@ -1,3 +1,13 @@
+from typing import Optional
+
+
 class PendingTransaction(Exception):
     def __init__(self, tx_hash: str) -> None:
         super().__init__(f"status transaction is pending: {tx_hash}")
+
+
+class TransactionReverted(Exception):
+    def __init__(self, reason: str, data: Optional[str] = None) -> None:
+        super().__init__(f"transaction would revert: {reason}")
+        self.reason = reason
+        self.data = data
@@ -1,6 +1,7 @@
 from web3 import AsyncWeb3
 
 from cache import redis
+from .batching import BatchingAsyncHTTPProvider
 
 
-provider = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(redis.get("rpc_url")))
+provider = AsyncWeb3(BatchingAsyncHTTPProvider(redis.get("rpc_url")))
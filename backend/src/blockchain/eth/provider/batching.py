@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Iterable, Optional, Union
+
+from eth_typing import URI
+from web3 import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UNBATCHED_METHODS = frozenset({"eth_sendRawTransaction", "eth_getLogs"})
+
+
+class BatchMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_size = 0
+        self.batch_sizes: Counter[int] = Counter()
+
+    def record(self, size: int) -> None:
+        self.requests += size
+        self.batches += 1
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.batch_sizes[size] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0,
+            "max_batch_size": self.max_batch_size,
+            "batch_sizes": dict(self.batch_sizes),
+        }
+
+
+class BatchingAsyncHTTPProvider(AsyncHTTPProvider):
+    """
+    Merges requests issued in the same event loop tick into one JSON-RPC batch
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: Optional[Union[URI, str]] = None,
+        unbatched_methods: Iterable[str] = DEFAULT_UNBATCHED_METHODS,
+        max_batch_size: int = 100,
+        **kwargs: Any,
+    ):
+        super().__init__(endpoint_uri, **kwargs)
+        self.unbatched_methods = set(unbatched_methods)
+        self.max_batch_size = max_batch_size
+        self.metrics = BatchMetrics()
+        self._pending: list[tuple[RPCEndpoint, Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method in self.unbatched_methods:
+            self.metrics.record(1)
+            return await super().make_request(method, params)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((method, params, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            asyncio.ensure_future(self._send(pending))
+
+    async def _send(self, pending: list[tuple[RPCEndpoint, Any, asyncio.Future]]) -> None:
+        self.metrics.record(len(pending))
+        try:
+            if len(pending) == 1:
+                method, params, _ = pending[0]
+                responses = [await super().make_request(method, params)]
+            else:
+                logger.debug(f"Sending JSON-RPC batch of {len(pending)} requests")
+                responses = await self.make_batch_request([(method, params) for method, params, _ in pending])
+                if len(responses) != len(pending):
+                    raise ValueError(f"Batch response size {len(responses)} does not match request size {len(pending)}")
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), response in zip(pending, responses):
+            if not future.done():
+                future.set_result(response)
@@ -0,0 +1,94 @@
+import json
+from typing import Any, Iterable, NamedTuple, Optional, Sequence, Union
+
+from eth_abi import decode
+from eth_abi.registry import registry
+from eth_typing import ChecksumAddress
+from eth_utils import abi_to_signature, function_abi_to_4byte_selector, get_abi_input_types, get_abi_output_types, keccak
+from web3._utils.abi import map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+
+class FunctionEncoder:
+    """
+    Selector and eth-abi tuple encoder of one ABI function, computed once per ABI
+    """
+
+    def __init__(self, abi: dict):
+        self.abi = abi
+        self.name: str = abi["name"]
+        self.selector: bytes = function_abi_to_4byte_selector(abi)
+        self.input_types: list[str] = get_abi_input_types(abi)
+        self.output_types: list[str] = get_abi_output_types(abi)
+        self._encoder = registry.get_tuple_encoder(*self.input_types)
+
+    def encode(self, args: Sequence[Any]) -> bytes:
+        return self.selector + self._encoder(args)
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decodes return data the way ContractFunction.call does: checksummed addresses,
+        a single value unwrapped from the output tuple
+        """
+        values = map_abi_data(BASE_RETURN_NORMALIZERS, self.output_types, decode(self.output_types, data))
+        return values[0] if len(values) == 1 else tuple(values)
+
+
+class BoundCall(NamedTuple):
+    address: ChecksumAddress
+    function: FunctionEncoder
+    args: tuple
+
+    def calldata(self) -> bytes:
+        return self.function.encode(self.args)
+
+
+class ContractABI:
+    """
+    Parsed ABI shared by all contract objects built from it
+    """
+
+    def __init__(self, abi: Union[str, list]):
+        self.abi: list[dict] = json.loads(abi) if isinstance(abi, str) else abi
+        # overloaded functions are not used by our contracts, the last definition wins
+        self.functions: dict[str, FunctionEncoder] = {
+            entry["name"]: FunctionEncoder(entry) for entry in self.abi if entry["type"] == "function"
+        }
+
+        self.errors: dict[bytes, dict] = {
+            keccak(text=abi_to_signature(entry))[:4]: entry for entry in self.abi if entry["type"] == "error"
+        }
+
+    def __getitem__(self, fn_name: str) -> FunctionEncoder:
+        return self.functions[fn_name]
+
+    def encode(self, fn_name: str, args: Sequence[Any]) -> bytes:
+        return self.functions[fn_name].encode(args)
+
+    def decode_error(self, data: bytes) -> Optional[str]:
+        """
+        Custom error from revert data, e.g. `AddressEmptyCode(0x...)`
+        """
+        entry = self.errors.get(data[:4])
+        if entry is None:
+            return None
+        try:
+            args = decode(get_abi_input_types(entry), data[4:])
+        except Exception:
+            return None
+        return f"{entry['name']}({', '.join(map(str, args))})"
+
+
+_abis: dict[Union[str, int], ContractABI] = {}
+
+
+def known_abis() -> Iterable[ContractABI]:
+    return _abis.values()
+
+
+def get_contract_abi(abi: Union[str, list]) -> ContractABI:
+    # ABIs are module level constants, lists are keyed by identity and kept alive by the cached entry
+    key = abi if isinstance(abi, str) else id(abi)
+    if key not in _abis:
+        _abis[key] = ContractABI(abi)
+    return _abis[key]
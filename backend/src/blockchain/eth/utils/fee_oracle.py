@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from statistics import median
+from typing import Optional
+
+from django.conf import settings
+from web3 import AsyncWeb3
+from web3.exceptions import MethodUnavailable, Web3RPCError
+
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC "method not found"
+METHOD_NOT_FOUND = -32601
+
+
+def _is_unsupported(error: Exception) -> bool:
+    if isinstance(error, MethodUnavailable):
+        return True
+    response = getattr(error, "rpc_response", None) or {}
+    return isinstance(error, Web3RPCError) and (response.get("error") or {}).get("code") == METHOD_NOT_FOUND
+
+
+class FeeOracle:
+    """
+    Polls `eth_feeHistory` in the background and serves EIP-1559 fees from memory.
+    Falls back to legacy `gasPrice` on chains without a base fee or `eth_feeHistory`,
+    transient errors keep the last fees.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        interval: float = 5,
+        block_count: int = 10,
+        priority_percentile: float = 50,
+        base_fee_multiplier: float = 2,
+        min_priority_fee: int = 0,
+    ):
+        self._w3 = w3
+        self.interval = interval
+        self.block_count = block_count
+        self.priority_percentile = priority_percentile
+        self.base_fee_multiplier = base_fee_multiplier
+        self.min_priority_fee = min_priority_fee
+        self.eip1559: Optional[bool] = None
+        self._fees: Optional[dict] = None
+        self._updated_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def update(self) -> dict:
+        history = None
+        if self.eip1559 is not False:
+            try:
+                history = await self._w3.eth.fee_history(self.block_count, "latest", [self.priority_percentile])
+                self.eip1559 = bool(history.get("baseFeePerGas")) and history["baseFeePerGas"][-1] > 0
+            except Exception as e:
+                if _is_unsupported(e):
+                    logger.warning(f"eth_feeHistory is not available, using legacy gas price: {e}")
+                    self.eip1559 = False
+                elif self._fees is not None:
+                    logger.warning(f"Error reading fee history, keeping last fees: {e}")
+                    return self._fees
+                else:
+                    logger.warning(f"Error reading fee history, using gas price until it recovers: {e}")
+
+        if self.eip1559 and history is not None:
+            rewards = [reward[0] for reward in history.get("reward") or [] if reward]
+            # an empty or zero reward would leave transactions unmined behind any tipping one
+            priority_fee = max(int(median(rewards)) if rewards else 0, self.min_priority_fee)
+            self._fees = {
+                "maxFeePerGas": int(history["baseFeePerGas"][-1] * self.base_fee_multiplier) + priority_fee,
+                "maxPriorityFeePerGas": priority_fee,
+            }
+        else:
+            self._fees = {"gasPrice": await self._w3.eth.gas_price}
+        self._updated_at = time.monotonic()
+        return self._fees
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.update()
+            except Exception as e:
+                logger.error(f"Error updating fees: {e}")
+
+    async def get_fees(self) -> dict:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if self._fees is None or time.monotonic() - self._updated_at > self.interval * 3:
+            async with self._lock:
+                if self._fees is None or time.monotonic() - self._updated_at > self.interval * 3:
+                    await self.update()
+        return dict(self._fees)
+
+
+_oracles: dict[AsyncWeb3, FeeOracle] = {}
+
+
+def get_fee_oracle(w3: AsyncWeb3) -> FeeOracle:
+    if w3 not in _oracles:
+        _oracles[w3] = FeeOracle(
+            w3,
+            interval=settings.FEE_ORACLE_INTERVAL,
+            min_priority_fee=w3.to_wei(settings.FEE_ORACLE_MIN_PRIORITY_FEE, "gwei"),
+        )
+    return _oracles[w3]
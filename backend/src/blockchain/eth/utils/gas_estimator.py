@@ -0,0 +1,71 @@
+import logging
+import time
+
+from eth_utils import function_signature_to_4byte_selector
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.types import TxParams
+
+
+logger = logging.getLogger(__name__)
+
+# calls whose cost depends on the forwarded inner call or on the storage they touch rather than on their shape,
+# e.g. the first transfer to a new holder writes a zero slot and costs ~20k gas more than the next ones
+UNCACHED_SELECTORS = {
+    function_signature_to_4byte_selector(signature)
+    for signature in (
+        "execute(address,uint256,bytes,bytes)",
+        "transfer(address,uint256)",
+        "transferFrom(address,address,uint256)",
+        "approve(address,uint256)",
+    )
+}
+
+
+class GasEstimator:
+    """
+    Caches `eth_estimateGas` results per (contract, function selector, calldata size bucket),
+    a shape is estimated again once its entry is older than `ttl` seconds.
+    Forwarding calls and token transfers are estimated every time, other shapes keep the highest estimate seen.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        multiplier: float = 1.2,
+        ttl: float = 600,
+        bucket_size: int = 32,
+    ):
+        self._w3 = w3
+        self.multiplier = multiplier
+        self.ttl = ttl
+        self.bucket_size = bucket_size
+        self._cache: dict[tuple[str, bytes, int], tuple[int, float]] = {}
+
+    def _key(self, tx: TxParams) -> tuple[str, bytes, int]:
+        data = HexBytes(tx.get("data", b""))
+        return tx["to"], bytes(data[:4]), len(data) // self.bucket_size
+
+    async def estimate(self, tx: TxParams) -> int:
+        key = self._key(tx)
+        if key[1] in UNCACHED_SELECTORS:
+            return int(await self._w3.eth.estimate_gas(tx) * self.multiplier)
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.ttl:
+            return cached[0]
+
+        gas = int(await self._w3.eth.estimate_gas(tx) * self.multiplier)
+        logger.debug(f"Gas estimate for {tx['to']} {key[1].hex()}: {gas}")
+        # an expired entry is refreshed, but never lowered by a cheaper call of the same shape
+        gas = max(gas, cached[0]) if cached is not None else gas
+        self._cache[key] = (gas, time.monotonic())
+        return gas
+
+
+_estimators: dict[AsyncWeb3, GasEstimator] = {}
+
+
+def get_gas_estimator(w3: AsyncWeb3) -> GasEstimator:
+    if w3 not in _estimators:
+        _estimators[w3] = GasEstimator(w3)
+    return _estimators[w3]
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Any, NamedTuple, Optional, Sequence
+
+from eth_abi import decode, encode
+from eth_typing import ChecksumAddress
+from eth_utils import function_signature_to_4byte_selector
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+
+from blockchain.eth.utils.encoders import BoundCall
+from cache import facts
+
+
+logger = logging.getLogger(__name__)
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+# per call overhead in aggregate3 calldata: target, allowFailure, offset and length words
+CALL_OVERHEAD = 4 * 32
+
+
+class CallResult(NamedTuple):
+    success: bool
+    value: Any = None
+    # raw revert data, or a description when the returned data could not be decoded
+    error: Optional[str] = None
+
+
+class BatchReader:
+    """
+    Aggregates view calls to any contracts into Multicall3 `aggregate3` calls.
+    Calls are split into several aggregates by calldata size, every call may fail on its own.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        address: Optional[str] = None,
+        max_calldata_size: int = 64 * 1024,
+        max_calls: int = 500,
+    ):
+        self._w3 = w3
+        self._address = address
+        self.max_calldata_size = max_calldata_size
+        self.max_calls = max_calls
+
+    @property
+    def address(self) -> ChecksumAddress:
+        return self._w3.to_checksum_address(self._address or facts.config("multicall3_address", MULTICALL3_ADDRESS))
+
+    def _split(self, calls: list[tuple[str, bool, bytes]]) -> list[list[tuple[str, bool, bytes]]]:
+        chunks, chunk, size = [], [], 0
+        for call in calls:
+            call_size = CALL_OVERHEAD + (len(call[2]) + 31) // 32 * 32
+            if chunk and (size + call_size > self.max_calldata_size or len(chunk) >= self.max_calls):
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(call)
+            size += call_size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def _aggregate(self, calls: list[tuple[str, bool, bytes]], block_identifier) -> list[tuple[bool, bytes]]:
+        data = await self._w3.eth.call(
+            {"to": self.address, "data": AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [calls])},
+            block_identifier,
+        )
+        return decode(["(bool,bytes)[]"], data)[0]
+
+    @staticmethod
+    def _decode(call: BoundCall, success: bool, data: bytes) -> CallResult:
+        if not success:
+            return CallResult(False, error=HexBytes(data).to_0x_hex())
+        try:
+            return CallResult(True, call.function.decode(data))
+        except Exception as e:
+            # empty return data from an address without code ends up here
+            return CallResult(False, error=f"Could not decode {call.function.name} result: {e}")
+
+    async def read(self, calls: Sequence[BoundCall], block_identifier="latest") -> list[CallResult]:
+        """
+        Executes bound calls, e.g. `token.function("balanceOf", address)`,
+        and returns their results in the same order
+        """
+        chunks = self._split([(call.address, True, call.calldata()) for call in calls])
+        results = await asyncio.gather(*(self._aggregate(chunk, block_identifier) for chunk in chunks))
+        logger.debug(f"Read {len(calls)} calls in {len(chunks)} aggregate3 calls")
+        return [
+            self._decode(call, success, data)
+            for call, (success, data) in zip(calls, (result for chunk in results for result in chunk))
+        ]
+
+
+_readers: dict[AsyncWeb3, BatchReader] = {}
+
+
+def get_batch_reader(w3: AsyncWeb3) -> BatchReader:
+    if w3 not in _readers:
+        _readers[w3] = BatchReader(w3)
+    return _readers[w3]
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Union
+
+from eth_typing import ChecksumAddress
+from eth_typing.evm import AnyAddress
+from web3 import AsyncWeb3
+
+from cache import aredis
+from cache.provider import AsyncRedisOverride
+
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] - next free nonce, KEYS[2] - time of the last allocation in ms, KEYS[3] - zset of released nonces,
+# ARGV[1] - pending nonce on chain, ARGV[2] - "1" to lower a local value ahead of chain, ARGV[3] - quiet period in ms.
+# The value is lowered only when nothing was allocated for the quiet period, otherwise allocated nonces that are
+# not broadcast yet would be handed out again.
+SYNC_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '-1')
+local chain = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', '(' .. chain)
+if current < chain then
+    redis.call('SET', KEYS[1], chain)
+    return chain
+end
+if ARGV[2] == '1' and current > chain then
+    local now = redis.call('TIME')
+    local allocated_at = tonumber(redis.call('GET', KEYS[2]) or '0')
+    if tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000) - allocated_at >= tonumber(ARGV[3]) then
+        redis.call('SET', KEYS[1], chain)
+        redis.call('DEL', KEYS[3])
+        return chain
+    end
+end
+return current
+"""
+
+# KEYS[1] - next free nonce, KEYS[2] - time of the last allocation in ms, KEYS[3] - zset of released nonces.
+# Released nonces are handed out lowest first, so a hole left by a failed send is filled by the next one.
+ALLOCATE_SCRIPT = """
+local now = redis.call('TIME')
+redis.call('SET', KEYS[2], tostring(tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)))
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+while true do
+    local released = redis.call('ZPOPMIN', KEYS[3])
+    if #released == 0 then
+        break
+    end
+    if tonumber(released[1]) < current then
+        return tonumber(released[1])
+    end
+end
+return redis.call('INCR', KEYS[1]) - 1
+"""
+
+# KEYS[1] - next free nonce, KEYS[3] - zset of released nonces, ARGV[1] - nonce to give back.
+# The latest allocated nonce lowers the counter, together with released ones right below it,
+# any other one is kept for the next allocation.
+RELEASE_SCRIPT = """
+local nonce = tonumber(ARGV[1])
+if tonumber(redis.call('GET', KEYS[1]) or '-1') ~= nonce + 1 then
+    redis.call('ZADD', KEYS[3], nonce, nonce)
+    return 0
+end
+while redis.call('ZREM', KEYS[3], nonce - 1) == 1 do
+    nonce = nonce - 1
+end
+redis.call('SET', KEYS[1], nonce)
+return 1
+"""
+
+NONCE_ERRORS = ("nonce too low", "already known", "known transaction", "replacement transaction underpriced")
+
+
+class NonceManager:
+    """
+    Allocates nonces for a single sender from a Redis counter shared by all workers.
+    Nonces of sends that never reached the mempool are handed out again before new ones.
+    The counter is resynced with the chain periodically and after failed sends,
+    it is only moved back to the chain value once no nonce was allocated for `resync_interval`.
+    Transactions dropped from the mempool are rebroadcast by the outbox worker.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        address: Union[AnyAddress, str],
+        cache: AsyncRedisOverride = aredis,
+        resync_interval: float = 30,
+    ):
+        self._w3 = w3
+        self.address: ChecksumAddress = w3.to_checksum_address(address)
+        self.resync_interval = resync_interval
+        self._cache = cache
+        self._key = f"nonce:{self.address}"
+        self._allocated_at_key = f"nonce:{self.address}:allocated_at"
+        self._released_key = f"nonce:{self.address}:released"
+        self._keys = [self._key, self._allocated_at_key, self._released_key]
+        self._sync_script = cache.register_script(SYNC_SCRIPT)
+        self._allocate_script = cache.register_script(ALLOCATE_SCRIPT)
+        self._release_script = cache.register_script(RELEASE_SCRIPT)
+        self._lock = asyncio.Lock()
+        self._synced_at = 0.0
+        self._chain_nonce = -1
+
+    async def sync(self, force: bool = False) -> int:
+        chain_nonce = await self._w3.eth.get_transaction_count(self.address, "pending")
+        # chain did not move for a whole interval while we are ahead of it - a tx may have been dropped
+        stuck = chain_nonce == self._chain_nonce and time.monotonic() - self._synced_at >= self.resync_interval
+        lower = force or stuck
+        nonce = int(await self._sync_script(
+            keys=self._keys,
+            args=[chain_nonce, int(lower), int(self.resync_interval * 1000)],
+        ))
+        if nonce == chain_nonce and lower:
+            logger.info(f"Nonce for {self.address} reset to chain value {chain_nonce}")
+        self._chain_nonce = chain_nonce
+        self._synced_at = time.monotonic()
+        return nonce
+
+    async def allocate(self) -> int:
+        if time.monotonic() - self._synced_at >= self.resync_interval:
+            async with self._lock:
+                if time.monotonic() - self._synced_at >= self.resync_interval:
+                    await self.sync()
+        return int(await self._allocate_script(keys=self._keys))
+
+    async def next_nonce(self) -> Optional[int]:
+        return await self._cache.get(self._key)
+
+    async def release(self, nonce: int, error: Exception) -> None:
+        """
+        Called when a tx with ``nonce`` never reached the mempool
+        """
+        message = str(error).lower()
+        if any(e in message for e in NONCE_ERRORS):
+            async with self._lock:
+                await self.sync()
+        else:
+            await self._release_script(keys=self._keys, args=[nonce])
+
+
+_managers: dict[str, NonceManager] = {}
+
+
+def get_nonce_manager(w3: AsyncWeb3, address: Union[AnyAddress, str]) -> NonceManager:
+    address = w3.to_checksum_address(address)
+    if address not in _managers:
+        _managers[address] = NonceManager(w3, address)
+    return _managers[address]
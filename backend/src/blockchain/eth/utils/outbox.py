@@ -0,0 +1,33 @@
+from eth_account.datastructures import SignedTransaction
+from web3.types import TxParams
+
+
+class TransactionOutbox:
+    """
+    Storage hook of sign_txn_and_send. Signed transactions are recorded before the broadcast,
+    their replacements are looked up by the receipt watcher. The default keeps nothing.
+    """
+
+    async def record(self, transaction: TxParams, signed_txn: SignedTransaction) -> None:
+        pass
+
+    async def fail(self, tx_hash: str, error: Exception) -> None:
+        pass
+
+    async def hashes(self, tx_hashes: list[str]) -> dict[str, list[str]]:
+        """
+        Every broadcast hash of each transaction, including replacements by fee
+        """
+        return {tx_hash: [tx_hash] for tx_hash in tx_hashes}
+
+
+_outbox = TransactionOutbox()
+
+
+def set_outbox(outbox: TransactionOutbox) -> None:
+    global _outbox
+    _outbox = outbox
+
+
+def get_outbox() -> TransactionOutbox:
+    return _outbox
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from typing import Optional, Union
+
+from eth_typing import HexStr
+from eth_typing.evm import Hash32
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt
+
+from blockchain.eth.exception import PendingTransaction
+from blockchain.eth.utils.outbox import get_outbox
+from blockchain.eth.utils.web3_extentions import get_tx_receipt
+
+
+logger = logging.getLogger(__name__)
+
+# default time wait() gives a transaction to be mined
+RECEIPT_TIMEOUT = 120
+
+
+class ReceiptWatcher:
+    """
+    Follows new blocks with a single polling loop and resolves waiters of all tracked transactions.
+    Receipts are re-read on every new block until they are `confirmations` deep,
+    so a transaction dropped by a reorg goes back to waiting.
+    Newly registered transactions are checked on the next tick, they may already be mined on an idle chain.
+    Waiters get the receipt of whichever outbox replacement of their transaction is mined.
+    """
+
+    def __init__(self, w3: AsyncWeb3, poll_interval: float = 1, confirmations: int = 0):
+        self._w3 = w3
+        self.poll_interval = poll_interval
+        self.confirmations = confirmations
+        self._watches: dict[str, list[tuple[asyncio.Future, int]]] = {}
+        # registered since the last check
+        self._new: set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.head: Optional[int] = None
+
+    async def wait(
+        self,
+        tx_hash: Union[Hash32, HexBytes, HexStr],
+        timeout: float = RECEIPT_TIMEOUT,
+        confirmations: Optional[int] = None,
+    ) -> TxReceipt:
+        key = HexBytes(tx_hash).to_0x_hex()
+        future = asyncio.get_running_loop().create_future()
+        watch = (future, self.confirmations if confirmations is None else confirmations)
+        self._watches.setdefault(key, []).append(watch)
+        self._new.add(key)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(f"Transaction {key} is not in the chain after {timeout} seconds")
+        finally:
+            watches = self._watches.get(key, [])
+            if watch in watches:
+                watches.remove(watch)
+            if not watches:
+                self._watches.pop(key, None)
+
+    async def _run(self) -> None:
+        while self._watches:
+            try:
+                head = await self._w3.eth.block_number
+                if head != self.head:
+                    self.head = head
+                    self._new.clear()
+                    await self._check(head, list(self._watches))
+                elif self._new:
+                    tx_hashes, self._new = [key for key in self._new if key in self._watches], set()
+                    await self._check(head, tx_hashes)
+            except Exception as e:
+                logger.error(f"Error checking receipts: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _check(self, head: int, tx_hashes: list[str]) -> None:
+        # replacements are re-read on every check, the worker may have bumped the fee since the last one
+        replacements = await get_outbox().hashes(tx_hashes)
+        candidates = [(tx_hash, sent) for tx_hash in tx_hashes for sent in replacements.get(tx_hash, [tx_hash])]
+        receipts = await asyncio.gather(
+            *(get_tx_receipt(self._w3, sent) for _, sent in candidates),
+            return_exceptions=True,
+        )
+        for (tx_hash, sent), receipt in zip(candidates, receipts):
+            if isinstance(receipt, PendingTransaction) or receipt is None:
+                continue
+            if isinstance(receipt, Exception):
+                logger.error(f"Error getting receipt of {sent}: {receipt}")
+                continue
+            for future, confirmations in self._watches.get(tx_hash, []):
+                if not future.done() and head - receipt["blockNumber"] >= confirmations:
+                    future.set_result(receipt)
+
+
+_watchers: dict[AsyncWeb3, ReceiptWatcher] = {}
+
+
+def get_receipt_watcher(w3: AsyncWeb3) -> ReceiptWatcher:
+    if w3 not in _watchers:
+        _watchers[w3] = ReceiptWatcher(w3)
+    return _watchers[w3]
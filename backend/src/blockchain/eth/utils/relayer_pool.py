@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from typing import AsyncIterator, Optional, Sequence
+
+from django.conf import settings
+from eth_account.signers.local import LocalAccount
+from web3 import AsyncWeb3
+
+from blockchain.eth.utils.nonce_manager import get_nonce_manager
+from blockchain.eth.utils.receipt_watcher import get_receipt_watcher
+from blockchain.eth.utils.web3_extentions import send_native_token
+from cache import aredis
+from cache.provider import AsyncRedisOverride
+
+
+logger = logging.getLogger(__name__)
+
+
+class RelayerLane:
+    def __init__(self, w3: AsyncWeb3, private_key: str):
+        self.account: LocalAccount = w3.eth.account.from_key(private_key)
+        self.address = self.account.address
+        self.nonces = get_nonce_manager(w3, self.address)
+        # sends of this process that hold the lane, from nonce allocation until broadcast
+        self.in_flight = 0
+        self.low_balance = False
+        self.balance_checked_at = 0.0
+
+
+class RelayerPool:
+    """
+    Spreads transactions over several relayer keys, each with its own nonce sequence.
+    Members running low on gas are topped up from the treasury key.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        private_keys: Sequence[str],
+        treasury_key: Optional[str] = None,
+        min_balance: Decimal = Decimal("0.1"),
+        top_up_amount: Decimal = Decimal("0.5"),
+        balance_check_interval: float = 60,
+        cache: AsyncRedisOverride = aredis,
+    ):
+        self._w3 = w3
+        self.lanes = [RelayerLane(w3, private_key) for private_key in dict.fromkeys(private_keys)]
+        self._treasury_key = treasury_key
+        self.min_balance = w3.to_wei(min_balance, "ether")
+        self.top_up_amount = top_up_amount
+        self.balance_check_interval = balance_check_interval
+        self._cache = cache
+        self._tasks: set[asyncio.Task] = set()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[LocalAccount]:
+        """
+        Least loaded lane, lanes waiting for a top-up are only used when nothing else is left
+        """
+        lane = min(self.lanes, key=lambda lane: (lane.low_balance, lane.in_flight))
+        lane.in_flight += 1
+        self._check_balance(lane)
+        try:
+            yield lane.account
+        finally:
+            lane.in_flight -= 1
+
+    def _check_balance(self, lane: RelayerLane) -> None:
+        if not self._treasury_key or time.monotonic() - lane.balance_checked_at < self.balance_check_interval:
+            return
+        lane.balance_checked_at = time.monotonic()
+        task = asyncio.create_task(self._top_up(lane))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _top_up(self, lane: RelayerLane) -> None:
+        key = f"relayer:top_up:{lane.address}"
+        try:
+            lane.low_balance = await self._w3.eth.get_balance(lane.address) < self.min_balance
+            # a single top-up per lane across all processes
+            if not lane.low_balance or not await self._cache.redis.set(key, 1, nx=True, ex=300):
+                return
+            txid = await send_native_token(self._w3, lane.address, self.top_up_amount, self._treasury_key)
+            logger.info(f"Relayer {lane.address} topped up with {self.top_up_amount}, txid: {txid.to_0x_hex()}")
+            await get_receipt_watcher(self._w3).wait(txid)
+            lane.low_balance = False
+            await self._cache.delete(key)
+        except Exception as e:
+            logger.error(f"Error topping up relayer {lane.address}: {e}")
+
+    async def queue_depths(self) -> list[dict]:
+        """
+        Per lane sends in progress in this process and transactions waiting in the mempool
+        """
+        mined, allocated = await asyncio.gather(
+            asyncio.gather(*(self._w3.eth.get_transaction_count(lane.address, "latest") for lane in self.lanes)),
+            asyncio.gather(*(lane.nonces.next_nonce() for lane in self.lanes)),
+        )
+        return [
+            {
+                "address": lane.address,
+                "in_flight": lane.in_flight,
+                "pending": max((next_nonce or 0) - mined_nonce, 0),
+                "low_balance": lane.low_balance,
+            }
+            for lane, mined_nonce, next_nonce in zip(self.lanes, mined, allocated)
+        ]
+
+
+_pools: dict[AsyncWeb3, RelayerPool] = {}
+
+
+def get_relayer_pool(w3: AsyncWeb3) -> RelayerPool:
+    if w3 not in _pools:
+        if settings.RELAYER_PRIVATE_KEYS:
+            _pools[w3] = RelayerPool(
+                w3,
+                settings.RELAYER_PRIVATE_KEYS,
+                treasury_key=settings.PRIVATE_KEY,
+                min_balance=settings.RELAYER_MIN_BALANCE,
+                top_up_amount=settings.RELAYER_TOP_UP_AMOUNT,
+            )
+        else:
+            # without dedicated relayers the treasury key is the only lane
+            _pools[w3] = RelayerPool(w3, [settings.PRIVATE_KEY])
+    return _pools[w3]
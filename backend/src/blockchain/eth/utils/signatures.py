@@ -0,0 +1,62 @@
+from typing import Optional, Sequence
+
+from eth_keys import keys
+from eth_utils import keccak, to_canonical_address
+
+try:
+    import coincurve
+except ImportError:  # pragma: no cover
+    coincurve = None
+
+
+# SimpleAccount._ecrecover prefixes the 32-byte digest with "\x19Ethereum Signed Message:\n" + "32"
+EIP191_PREFIX = b"\x19Ethereum Signed Message:\n32"
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+
+def execute_digest(dest: str, value: int, func: bytes) -> bytes:
+    """
+    keccak256(abi.encodePacked(dest, value, func)) as checked by SimpleAccount.execute, with the EIP-191 prefix
+    """
+    message = keccak(to_canonical_address(dest) + value.to_bytes(32, "big") + func)
+    return keccak(EIP191_PREFIX + message)
+
+
+def _recover_public_key(digest: bytes, signature: bytes) -> bytes:
+    """
+    Uncompressed public key without the 0x04 prefix
+    """
+    if coincurve is not None:
+        recoverable = signature[:64] + bytes([signature[64] - 27])
+        return coincurve.PublicKey.from_signature_and_message(recoverable, digest, hasher=None).format(False)[1:]
+    return keys.Signature(signature[:64] + bytes([signature[64] - 27])).recover_public_key_from_msg_hash(
+        digest
+    ).to_bytes()
+
+
+def recover_signer(digest: bytes, signature: bytes) -> Optional[str]:
+    """
+    Lowercase address recovered the way the EVM ecrecover precompile does it, None where ecrecover returns zero
+    """
+    if len(signature) != 65 or signature[64] not in (27, 28):
+        return None
+    r, s = int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:64], "big")
+    if not (0 < r < SECP256K1_N and 0 < s < SECP256K1_N):
+        return None
+    try:
+        public_key = _recover_public_key(digest, signature)
+    except Exception:
+        return None
+    return "0x" + keccak(public_key)[-20:].hex()
+
+
+def verify_execute(dest: str, value: int, func: bytes, signature: bytes, signer: str) -> bool:
+    recovered = recover_signer(execute_digest(dest, value, func), signature)
+    return recovered is not None and recovered == signer.lower()
+
+
+def verify_execute_many(payloads: Sequence[tuple[str, int, bytes, bytes, str]]) -> list[bool]:
+    """
+    Verifies many (dest, value, func, signature, signer) payloads in one call
+    """
+    return [verify_execute(*payload) for payload in payloads]
@@ -0,0 +1,90 @@
+import logging
+from typing import Optional
+
+from eth_abi import decode
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.exceptions import ContractLogicError
+from web3.types import TxParams
+
+from blockchain.eth.exception import TransactionReverted
+from blockchain.eth.utils.encoders import ContractABI, known_abis
+from cache.local import MISSING, LocalCache
+
+
+logger = logging.getLogger(__name__)
+
+ERROR_SELECTOR = bytes.fromhex("08c379a0")
+PANIC_SELECTOR = bytes.fromhex("4e487b71")
+PANIC_REASONS = {
+    0x01: "assert failed",
+    0x11: "arithmetic overflow",
+    0x12: "division by zero",
+    0x21: "invalid enum value",
+    0x32: "array index out of bounds",
+    0x41: "out of memory",
+    0x51: "call to zero function",
+}
+
+
+def decode_revert(data: bytes, abi: Optional[ContractABI] = None) -> str:
+    """
+    Error(string), Panic(uint256) or a custom error of `abi` or any other known ABI
+    """
+    if not data:
+        return "execution reverted"
+    try:
+        if data[:4] == ERROR_SELECTOR:
+            return decode(["string"], data[4:])[0]
+        if data[:4] == PANIC_SELECTOR:
+            code = decode(["uint256"], data[4:])[0]
+            return f"Panic(0x{code:02x}): {PANIC_REASONS.get(code, 'unknown panic')}"
+        for candidate in ([abi] if abi else []) + list(known_abis()):
+            if reason := candidate.decode_error(data):
+                return reason
+    except Exception as e:
+        # truncated or malformed revert data still has to surface as a revert
+        logger.debug(f"Could not decode revert data: {e}")
+    return f"unknown error {HexBytes(data).to_0x_hex()}"
+
+
+class TransactionSimulator:
+    """
+    Runs transactions as eth_call against the pending block before they are broadcast.
+    Results are cached for `ttl` seconds, roughly a block, so identical payloads are simulated once.
+    """
+
+    def __init__(self, w3: AsyncWeb3, ttl: float = 2, maxsize: int = 1024):
+        self._w3 = w3
+        self._results = LocalCache(maxsize=maxsize, ttl=ttl)
+
+    async def simulate(self, tx: TxParams, abi: Optional[ContractABI] = None) -> None:
+        """
+        Raises TransactionReverted with the decoded reason when the transaction would revert
+        """
+        key = (tx["from"], tx["to"], HexBytes(tx["data"]), tx.get("value", 0))
+        result = self._results.get(key)
+        if result is MISSING:
+            result = await self._simulate(tx, abi)
+            self._results.set(key, result)
+        if result is not None:
+            raise TransactionReverted(result.reason, result.data)
+
+    async def _simulate(self, tx: TxParams, abi: Optional[ContractABI]) -> Optional[TransactionReverted]:
+        try:
+            await self._w3.eth.call(tx, "pending")
+        except ContractLogicError as e:
+            data = HexBytes(e.data) if isinstance(e.data, str) else b""
+            reason = decode_revert(data, abi) if data else e.message or "execution reverted"
+            logger.warning(f"Simulation of call to {tx['to']} reverted: {reason}")
+            return TransactionReverted(reason, HexBytes(data).to_0x_hex() if data else None)
+        return None
+
+
+_simulators: dict[AsyncWeb3, TransactionSimulator] = {}
+
+
+def get_simulator(w3: AsyncWeb3) -> TransactionSimulator:
+    if w3 not in _simulators:
+        _simulators[w3] = TransactionSimulator(w3)
+    return _simulators[w3]
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional, Union
 
 from eth_typing import HexStr
@@ -5,9 +6,21 @@ from eth_typing.evm import AnyAddress, Hash32
 from hexbytes import HexBytes
 from web3 import AsyncWeb3
 from web3.exceptions import TransactionNotFound
-from web3.types import TxParams
+from web3.types import TxParams, TxReceipt
 
 from blockchain.eth.exception import PendingTransaction
+from cache import facts
+from blockchain.eth.utils.fee_oracle import get_fee_oracle
+from blockchain.eth.utils.nonce_manager import get_nonce_manager
+from blockchain.eth.utils.outbox import get_outbox
+
+
+async def _const(value):
+    return value
+
+
+async def get_chain_id(w3: AsyncWeb3) -> int:
+    return await facts.get("rpc_chain_id", lambda: w3.eth.chain_id, shared=False)
 
 
 async def build_tx(
@@ -18,13 +31,17 @@ async def build_tx(
     gas_price: Union[None, int, str] = None,
 ) -> dict:
     from_address = w3.to_checksum_address(from_address)
-    nonce = await w3.eth.get_transaction_count(from_address, "pending")
+    # independent reads go out concurrently so the batching provider can merge them
+    chain_id, fees = await asyncio.gather(
+        _const(chain_id) if chain_id else get_chain_id(w3),
+        _const({"gasPrice": gas_price}) if gas_price else get_fee_oracle(w3).get_fees(),
+    )
     tx = {
-        "chainId": chain_id if chain_id else await w3.eth.chain_id,
-        "gasPrice": gas_price if gas_price else await w3.eth.gas_price,
-        "nonce": nonce,
+        "chainId": chain_id,
         "from": from_address,
+        **fees,
     }
+    tx["nonce"] = await get_nonce_manager(w3, from_address).allocate()
 
     if gas:
         tx["gas"] = gas
@@ -32,8 +49,19 @@ async def build_tx(
 
 
 async def sign_txn_and_send(w3: AsyncWeb3, transaction: TxParams, private_key: str) -> HexBytes:
-    signed_txn = w3.eth.account.sign_transaction(transaction, private_key)
-    return await w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+    """
+    Signed transactions are stored in the outbox before the broadcast, so stuck ones can be replaced by fee
+    """
+    signed_txn = None
+    try:
+        signed_txn = w3.eth.account.sign_transaction(transaction, private_key)
+        await get_outbox().record(transaction, signed_txn)
+        return await w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+    except Exception as e:
+        if signed_txn is not None:
+            await get_outbox().fail(signed_txn.hash.to_0x_hex(), e)
+        await get_nonce_manager(w3, transaction["from"]).release(transaction["nonce"], e)
+        raise
 
 
 async def send_native_token(
@@ -46,7 +74,7 @@ async def send_native_token(
     chain_id: Optional[int] = None,
     decimals: int = 18,
 ) -> HexBytes:
-    chain_id = chain_id if chain_id else await provider.eth.chain_id
+    chain_id = chain_id if chain_id else await get_chain_id(provider)
     from_address = (
         provider.eth.account.from_key(private_key).address
         if not from_address
@@ -68,13 +96,20 @@ async def send_native_token(
     return await sign_txn_and_send(provider, tx, private_key)
 
 
-async def get_tx_status(w3: AsyncWeb3, tx_hash: Union[Hash32, HexBytes, HexStr]) -> bool:
+async def get_tx_receipt(w3: AsyncWeb3, tx_hash: Union[Hash32, HexBytes, HexStr]) -> Optional[TxReceipt]:
+    """
+    Returns None for an unknown transaction and raises PendingTransaction while it is not mined
+    """
     try:
-        tx_receipt = await w3.eth.get_transaction_receipt(tx_hash)
-        return bool(tx_receipt["status"])
+        return await w3.eth.get_transaction_receipt(tx_hash)
     except TransactionNotFound:
         try:
             await w3.eth.get_transaction(tx_hash)
         except TransactionNotFound:
-            return False
+            return None
         raise PendingTransaction(tx_hash)
+
+
+async def get_tx_status(w3: AsyncWeb3, tx_hash: Union[Hash32, HexBytes, HexStr]) -> bool:
+    tx_receipt = await get_tx_receipt(w3, tx_hash)
+    return bool(tx_receipt and tx_receipt["status"])
@@ -1,8 +1,19 @@
 from django.conf import settings
 
-from cache.provider import RedisOverride
+from cache.facts import FactCache
+from cache.local import LocalCache
+from cache.provider import AsyncRedisOverride, RedisOverride
+from cache.tiered import TieredCache
 
 redis = RedisOverride(
     host=settings.REDIS_HOST, port=settings.REDIS_PORT,
     password=settings.REDIS_PASSWORD
 )
+aredis = AsyncRedisOverride(
+    host=settings.REDIS_HOST, port=settings.REDIS_PORT,
+    password=settings.REDIS_PASSWORD, max_connections=settings.REDIS_MAX_CONNECTIONS
+)
+config = TieredCache(
+    redis, LocalCache(maxsize=settings.CONFIG_CACHE_SIZE, ttl=settings.CONFIG_CACHE_TTL)
+)
+facts = FactCache(redis, aredis, config)
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from cache.provider import AsyncRedisOverride, RedisOverride
+from cache.serializer import decode_value, encode_value
+from cache.tiered import TieredCache
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class FactCache:
+    """
+    In-process cache for values that do not change while the config stays the same:
+    config entries, chain id, token decimals, factory implementation.
+    Loaded values are shared with other processes through a Redis hash.
+    """
+
+    def __init__(
+        self,
+        cache: RedisOverride,
+        async_cache: AsyncRedisOverride,
+        config: TieredCache,
+        namespace: str = "facts",
+    ):
+        self._cache = cache
+        self._async_cache = async_cache
+        self._config = config
+        self._key = namespace
+        self._values: dict[str, Any] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        config.subscribe(self._drop)
+
+    def _drop(self, keys: Optional[list[str]]) -> None:
+        if keys is None:
+            logger.info("Config changed, dropping cached facts")
+            self._values.clear()
+
+    def config(self, key: str, default=None) -> Any:
+        return self._config.get(key, default)
+
+    def config_many(self, *keys: str, default=None) -> list:
+        """
+        Returns config entries, missing ones are loaded from Redis in one round trip
+        """
+        return self._config.get_many(*keys, default=default)
+
+    def preload_config(self, *keys: str) -> None:
+        """
+        Keeps config entries in memory until they change, call at startup for entries read by async code
+        """
+        self._config.preload(*keys)
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[T]], shared: bool = True) -> T:
+        self._config.listen()
+        if key in self._values:
+            return self._values[key]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key in self._values:
+                return self._values[key]
+            value = await self._async_cache.redis.hget(self._key, key) if shared else None
+            if value is not None:
+                value = decode_value(value)
+            else:
+                value = await loader()
+                if shared:
+                    await self._async_cache.redis.hset(self._key, key, encode_value(value))
+            self._values[key] = value
+        return value
+
+    def invalidate(self) -> None:
+        """
+        Drops cached facts and config entries in Redis and in every process
+        """
+        self._cache.delete(self._key)
+        self._config.publish(None)
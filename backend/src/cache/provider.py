@@ -1,8 +1,9 @@
-import contextlib
-import json
-from typing import Union
+from typing import Optional, Union
 
 from redis import Redis
+from redis.asyncio import BlockingConnectionPool, Redis as AsyncRedis
+
+from cache.serializer import decode_value, encode_value
 
 
 class RedisOverride:
@@ -13,23 +14,63 @@ class RedisOverride:
     def __init__(self, host: str, port: int, password: str):
         self.redis = Redis(host=host, port=port, password=password)
 
-    def set(self, key: str, value: Union[str, dict, list, int]):
-        if type(value) is not str:
-            value = json.dumps(value)
-        self.redis.set(key, value)
+    def set(self, key: str, value: Union[str, dict, list, int], ex: Optional[int] = None):
+        self.redis.set(key, encode_value(value), ex=ex)
 
     def get(self, key: str, default=None) -> Union[str, dict, int, list, None]:
-        value = self.redis.get(key)
-        if value is None:
-            return default
+        return decode_value(self.redis.get(key), default)
 
-        value = value.decode("utf-8")
-        with contextlib.suppress(Exception):
-            value = json.loads(value)
-        return value
+    def mget(self, *keys: str, default=None) -> list:
+        return [decode_value(value, default) for value in self.redis.mget(keys)]
 
-    def delete(self, key: str):
-        self.redis.delete(key)
+    def delete(self, *keys: str):
+        self.redis.delete(*keys)
 
     def exist(self, *names) -> bool:
         return self.redis.exists(*names)
+
+    def register_script(self, script: str):
+        return self.redis.register_script(script)
+
+
+class AsyncRedisOverride:
+    """
+    asyncio redis on a connection pool shared by the whole process
+    """
+
+    def __init__(self, host: str, port: int, password: str, max_connections: int = 50):
+        self.pool = BlockingConnectionPool(host=host, port=port, password=password, max_connections=max_connections)
+        self.redis = AsyncRedis(connection_pool=self.pool)
+
+    async def set(self, key: str, value: Union[str, dict, list, int], ex: Optional[int] = None):
+        await self.redis.set(key, encode_value(value), ex=ex)
+
+    async def get(self, key: str, default=None) -> Union[str, dict, int, list, None]:
+        return decode_value(await self.redis.get(key), default)
+
+    async def mget(self, *keys: str, default=None) -> list:
+        """
+        Loads several keys in one round trip
+        """
+        return [decode_value(value, default) for value in await self.redis.mget(keys)]
+
+    async def mset(self, mapping: dict[str, Union[str, dict, list, int]], ex: Optional[int] = None):
+        if ex is None:
+            await self.redis.mset({key: encode_value(value) for key, value in mapping.items()})
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, encode_value(value), ex=ex)
+            await pipe.execute()
+
+    def pipeline(self, transaction: bool = False):
+        return self.redis.pipeline(transaction=transaction)
+
+    async def delete(self, *keys: str):
+        await self.redis.delete(*keys)
+
+    async def exist(self, *names) -> bool:
+        return await self.redis.exists(*names)
+
+    def register_script(self, script: str):
+        return self.redis.register_script(script)
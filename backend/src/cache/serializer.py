@@ -0,0 +1,81 @@
+import contextlib
+import json
+from typing import Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+# first byte of every value written by encode_value, never the first byte of legacy utf-8 / json values
+STR = b"\x01"
+INT = b"\x02"
+JSON = b"\x03"
+ORJSON = b"\x04"
+MSGPACK = b"\x05"
+
+Value = Union[str, dict, list, int]
+
+
+def _dumps(value) -> bytes:
+    # orjson and msgpack are limited to 64-bit ints, wei amounts fall back to the stdlib
+    if orjson is not None:
+        with contextlib.suppress(TypeError):
+            return ORJSON + orjson.dumps(value)
+    elif msgpack is not None:
+        with contextlib.suppress(TypeError, OverflowError):
+            return MSGPACK + msgpack.packb(value)
+    return JSON + json.dumps(value).encode("utf-8")
+
+
+def _loads_orjson(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _loads_msgpack(data: bytes):
+    if msgpack is None:
+        raise RuntimeError("Value was written with msgpack, install msgpack to read it")
+    return msgpack.unpackb(data)
+
+
+def _loads_legacy(data: bytes):
+    value = data.decode("utf-8")
+    with contextlib.suppress(ValueError):
+        value = json.loads(value)
+    return value
+
+
+def encode_value(value: Value) -> bytes:
+    if type(value) is str:
+        return STR + value.encode("utf-8")
+    if type(value) is int:
+        return INT + str(value).encode("ascii")
+    return _dumps(value)
+
+
+def decode_value(value: bytes, default=None) -> Union[Value, None]:
+    if value is None:
+        return default
+
+    tag, data = value[:1], value[1:]
+    if tag == STR:
+        return data.decode("utf-8")
+    if tag == INT:
+        return int(data)
+    if tag == JSON:
+        # the stdlib keeps ints of any size, orjson would turn them into floats
+        return json.loads(data)
+    if tag == ORJSON:
+        return _loads_orjson(data)
+    if tag == MSGPACK:
+        return _loads_msgpack(data)
+    # untagged: written before tagging or by raw commands such as INCR
+    if value.isdigit():
+        return int(value)
+    return _loads_legacy(value)
@@ -0,0 +1,98 @@
+import json
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+from cache.local import LocalCache, MISSING
+from cache.provider import RedisOverride
+
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCache:
+    """
+    In-process L1 in front of Redis. Writers publish changed keys on `channel`,
+    every process drops them from its L1 as soon as the message arrives.
+    Preloaded keys never expire and are reloaded by the listener thread instead of dropped,
+    so reading them does not block an event loop on Redis.
+    """
+
+    def __init__(self, cache: RedisOverride, local: LocalCache, channel: str = "cache:invalidate"):
+        self._cache = cache
+        self.local = local
+        self.channel = channel
+        self._subscribers: list[Callable[[Optional[list[str]]], None]] = [self._drop]
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+        self._pinned: set[str] = set()
+
+    def get(self, key: str, default=None) -> Any:
+        return self.get_many(key, default=default)[0]
+
+    def get_many(self, *keys: str, default=None) -> list:
+        self.listen()
+        values = [self.local.get(key) for key in keys]
+        missing = [key for key, value in zip(keys, values) if value is MISSING]
+        if missing:
+            loaded = self._load(missing)
+            values = [loaded[key] if value is MISSING else value for key, value in zip(keys, values)]
+        return [default if value is None else value for value in values]
+
+    def preload(self, *keys: str) -> None:
+        """
+        Loads `keys` now and keeps them in the L1 until they change
+        """
+        self._pinned.update(keys)
+        self.listen()
+        self._load(list(keys))
+
+    def _load(self, keys: list[str]) -> dict[str, Any]:
+        loaded = dict(zip(keys, self._cache.mget(*keys)))
+        for key, value in loaded.items():
+            self.local.set(key, value, ttl=float("inf") if key in self._pinned else None)
+        return loaded
+
+    def set(self, key: str, value: Any) -> None:
+        self._cache.set(key, value)
+        self.publish([key])
+
+    def publish(self, keys: Optional[list[str]] = None) -> None:
+        """
+        Invalidates `keys` (or everything when None) in all processes
+        """
+        self._cache.redis.publish(self.channel, json.dumps(keys))
+
+    def subscribe(self, callback: Callable[[Optional[list[str]]], None]) -> None:
+        self._subscribers.append(callback)
+
+    def _drop(self, keys: Optional[list[str]]) -> None:
+        if keys is None:
+            self.local.clear()
+        else:
+            self.local.delete(*keys)
+        if reload := sorted(self._pinned if keys is None else self._pinned.intersection(keys)):
+            try:
+                self._load(reload)
+            except Exception as e:
+                # the next read loads them again
+                logger.error(f"Error reloading preloaded keys {reload}: {e}")
+
+    def _handle(self, message: dict) -> None:
+        keys = json.loads(message["data"])
+        logger.info(f"Cache invalidated: {'all keys' if keys is None else keys}")
+        for callback in self._subscribers:
+            callback(keys)
+
+    def listen(self) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            pubsub = self._cache.redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._handle})
+            # entries loaded while not subscribed could have missed an invalidation, in the L1 and in subscribers
+            for callback in self._subscribers:
+                callback(None)
+            self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
@@ -1,6 +1,7 @@
 import logging
 import os
 from datetime import timedelta
+from decimal import Decimal
 from pathlib import Path
 
 import dotenv
@@ -70,12 +71,20 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": "django.db.backends.postgresql",
         "NAME": os.getenv("DB_NAME"),
         "USER": os.getenv("DB_USER"),
         "PASSWORD": os.getenv("DB_PASS"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
+        "OPTIONS": {
+            # connections are returned to the pool at the end of a request instead of being closed
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 20)),
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            },
+        },
     }
 }
 
@@ -110,7 +119,6 @@ STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
 
 LOGGING = {
     'version': 1,
@@ -136,7 +144,18 @@ LOGGING = {
 }
 
 PRIVATE_KEY = os.getenv("PRIVATE_KEY")
+RELAYER_PRIVATE_KEYS = os.getenv("RELAYER_PRIVATE_KEYS", "").split()
+RELAYER_MIN_BALANCE = Decimal(os.getenv("RELAYER_MIN_BALANCE", "0.1"))
+RELAYER_TOP_UP_AMOUNT = Decimal(os.getenv("RELAYER_TOP_UP_AMOUNT", "0.5"))
+FEE_ORACLE_INTERVAL = float(os.getenv("FEE_ORACLE_INTERVAL", 5))
+FEE_ORACLE_MIN_PRIORITY_FEE = Decimal(os.getenv("FEE_ORACLE_MIN_PRIORITY_FEE", "0.01"))
+# days balance snapshots are kept for, 0 keeps them forever
+BALANCE_SNAPSHOT_RETENTION = float(os.getenv("BALANCE_SNAPSHOT_RETENTION", 30))
 
 REDIS_HOST = os.getenv("REDIS_HOST")
 REDIS_PORT = os.getenv("REDIS_PORT")
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+
+CONFIG_CACHE_SIZE = int(os.getenv("CONFIG_CACHE_SIZE", 1024))
+CONFIG_CACHE_TTL = float(os.getenv("CONFIG_CACHE_TTL", 300))
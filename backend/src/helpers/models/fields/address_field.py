@@ -0,0 +1,29 @@
+from django.db import models
+from eth_utils import is_address, to_checksum_address
+
+
+class AddressField(models.CharField):
+    """
+    EVM address stored lowercase, so plain indexes serve case-insensitive lookups.
+    Loaded values are checksummed, as web3 returns them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_length", 42)
+        super().__init__(*args, **kwargs)
+
+    def from_db_value(self, value, expression, connection):
+        return self.to_python(value)
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        return to_checksum_address(value) if isinstance(value, str) and is_address(value) else value
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        return value.lower() if isinstance(value, str) else value
+
+    def pre_save(self, model_instance, add):
+        value = self.to_python(getattr(model_instance, self.attname))
+        setattr(model_instance, self.attname, value)
+        return value
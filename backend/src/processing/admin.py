@@ -1,9 +1,24 @@
 from django.contrib import admin
 
 from helpers.admin.model import CustomModelAdmin
-from processing.models import Account
+from processing.models import Account, BalanceSnapshot, IndexerCheckpoint, OutgoingTransaction
 
 
 @admin.register(Account)
 class AccountAdmin(CustomModelAdmin):
     exclude = ["helper"]
+
+
+@admin.register(IndexerCheckpoint)
+class IndexerCheckpointAdmin(CustomModelAdmin):
+    pass
+
+
+@admin.register(BalanceSnapshot)
+class BalanceSnapshotAdmin(CustomModelAdmin):
+    exclude = ["data"]
+
+
+@admin.register(OutgoingTransaction)
+class OutgoingTransactionAdmin(CustomModelAdmin):
+    exclude = ["raw_tx", "params"]
@@ -1,6 +1,27 @@
+import logging
+
 from django.apps import AppConfig
 
 
+logger = logging.getLogger(__name__)
+
+# config entries read on every request or job, kept in memory so async code never waits for sync Redis
+PRELOADED_CONFIG = ("simple_account_factory", "rub_address", "chain_id", "multicall3_address", "indexer_start_block")
+
+
 class ProcessingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'processing'
+
+    def ready(self):
+        from blockchain.eth.utils.outbox import set_outbox
+        from cache import facts
+        from processing import signals  # noqa: F401
+        from processing.outbox import DatabaseOutbox
+
+        set_outbox(DatabaseOutbox())
+        try:
+            facts.preload_config(*PRELOADED_CONFIG)
+        except Exception as e:
+            # commands like migrate run without Redis, the entries are loaded on first use then
+            logger.warning(f"Error preloading config: {e}")
@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+from ninja import Schema
+from ninja_extra import status
+
+from blockchain.eth.utils.receipt_watcher import RECEIPT_TIMEOUT
+from cache import aredis
+from cache.provider import AsyncRedisOverride
+from cache.serializer import encode_value
+from helpers.schemas.base import JSONResponseException
+
+
+logger = logging.getLogger(__name__)
+
+HEADER = "Idempotency-Key"
+
+# KEYS[1] - idempotency key, ARGV[1] - claim of this request, ARGV[2] - new ttl or 0 to release
+CLAIM_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[2] == '0' then
+    return redis.call('DEL', KEYS[1])
+end
+return redis.call('EXPIRE', KEYS[1], ARGV[2])
+"""
+
+Handler = Callable[[], Awaitable[tuple[int, Schema]]]
+
+
+class _Claim:
+    def __init__(self, key: str, digest: str, claim: bytes):
+        self.key = key
+        self.digest = digest
+        self.claim = claim
+        self.checkpoint: Optional[tuple[int, Schema]] = None
+
+
+_current: ContextVar[Optional[_Claim]] = ContextVar("idempotency_claim", default=None)
+
+
+class IdempotencyStore:
+    """
+    Runs a request once per idempotency key.
+    The first request claims the key with SET NX and keeps the claim alive while it runs,
+    duplicates wait for its stored response instead of running again.
+    Responses with a 5xx status are not stored, so a retry after a server error runs the request again,
+    unless the handler stored a checkpoint, e.g. once its transaction was broadcast.
+    """
+
+    def __init__(
+        self,
+        cache: AsyncRedisOverride = aredis,
+        ttl: int = 24 * 60 * 60,
+        lock_ttl: int = 30,
+        # a relayed transaction waits up to RECEIPT_TIMEOUT for its receipt after simulation and broadcast
+        wait_timeout: float = RECEIPT_TIMEOUT * 2,
+        poll_interval: float = 0.25,
+    ):
+        self._cache = cache
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._claim_script = cache.register_script(CLAIM_SCRIPT)
+
+    @staticmethod
+    def key(request, scope: str, *payload) -> tuple[str, str]:
+        """
+        Key and payload digest. The key is the Idempotency-Key header when the client sends one,
+        otherwise the digest itself.
+        """
+        digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+        if client_key := request.headers.get(HEADER):
+            return f"idempotency:{scope}:key:{client_key}", digest
+        return f"idempotency:{scope}:payload:{digest}", digest
+
+    async def run(self, key: tuple[str, str], handler: Handler) -> tuple[int, Any]:
+        key, digest = key
+        claim = encode_value({"digest": digest, "claim": uuid.uuid4().hex})
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            if await self._cache.redis.set(key, claim, nx=True, ex=self.lock_ttl):
+                return await self._run(key, digest, claim, handler)
+            stored = await self._wait(key, digest, deadline)
+            if stored is not None and stored["digest"] != digest:
+                logger.warning(f"Idempotency key {key} reused with a different payload")
+                return status.HTTP_422_UNPROCESSABLE_ENTITY, JSONResponseException(
+                    detail="Idempotency key was already used with a different payload.",
+                )
+            if stored is not None and "status" in stored:
+                logger.info(f"Replaying stored response for {key}")
+                return stored["status"], stored["body"]
+            if time.monotonic() >= deadline:
+                return status.HTTP_409_CONFLICT, JSONResponseException(
+                    detail="A request with the same idempotency key is still in progress.",
+                )
+            # the first request failed and released the key, claim it again
+
+    async def _keep_claim(self, key: str, claim: bytes) -> None:
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            await self._claim_script(keys=[key], args=[claim, self.lock_ttl])
+
+    async def checkpoint(self, code: int, response: Schema) -> None:
+        """
+        Stores the response of a request that can no longer be retried safely, e.g. after its broadcast.
+        Duplicates replay it right away and a later failure of the handler is answered with it.
+        """
+        current = _current.get()
+        if current is None:
+            return
+        current.checkpoint = code, response
+        await self._store(current, code, response)
+
+    async def _store(self, current: _Claim, code: int, response: Schema) -> None:
+        await self._cache.set(
+            current.key, {"digest": current.digest, "status": code, "body": response.dict()}, ex=self.ttl
+        )
+
+    async def _run(self, key: str, digest: str, claim: bytes, handler: Handler) -> tuple[int, Any]:
+        current = _Claim(key, digest, claim)
+        token = _current.set(current)
+        keeper = asyncio.create_task(self._keep_claim(key, claim))
+        try:
+            code, response = await handler()
+        except BaseException:
+            if current.checkpoint is None:
+                await self._claim_script(keys=[key], args=[claim, 0])
+            raise
+        finally:
+            keeper.cancel()
+            _current.reset(token)
+        if code >= 500 and current.checkpoint is not None:
+            logger.warning(f"Request {key} failed after its checkpoint, answering with the checkpoint")
+            code, response = current.checkpoint
+        if code >= 500:
+            await self._claim_script(keys=[key], args=[claim, 0])
+        else:
+            await self._store(current, code, response)
+        return code, response
+
+    async def _wait(self, key: str, digest: str, deadline: float) -> Optional[dict]:
+        """
+        Stored response of the request holding `key`, or its claim right away when the payload differs.
+        None once the key is released, the claim when the deadline passes.
+        """
+        while True:
+            stored = await self._cache.get(key)
+            if stored is None or "status" in stored or stored["digest"] != digest or time.monotonic() >= deadline:
+                return stored
+            await asyncio.sleep(self.poll_interval)
+
+
+idempotency = IdempotencyStore()
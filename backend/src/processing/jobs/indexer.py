@@ -0,0 +1,236 @@
+import asyncio
+import logging
+from typing import Any
+
+from eth_utils import event_abi_to_log_topic
+from django.db import IntegrityError
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.types import LogReceipt
+
+from blockchain.eth.contracts import get_account, get_account_factory
+from blockchain.eth.contracts.abis.account import abi as account_abi
+from cache import facts
+from processing.models import Account, IndexerCheckpoint
+from processing.wallets import wallets
+
+
+logger = logging.getLogger(__name__)
+
+# wallet addresses per eth_getLogs address filter
+ADDRESS_CHUNK = 500
+# ERC-1967 implementation slot, bytes32(uint256(keccak256("eip1967.proxy.implementation")) - 1)
+IMPLEMENTATION_SLOT = 0x360894A13BA1A3210667C828492DB98DCA3E2076CC3735A920A3CA505D382BBC
+
+
+class AccountIndexer:
+    """
+    Mirrors SimpleAccountFactory and SimpleAccount events into the Account table.
+    Indexes `confirmations` blocks behind the head and rewinds `reorg_depth` blocks
+    when the checkpointed block is no longer canonical. Wallet events are only fetched for known wallets,
+    starting at `indexer_start_block` of the config or the factory deployment block found on chain.
+    """
+
+    name = "accounts"
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        chunk_size: int = 2000,
+        confirmations: int = 12,
+        reorg_depth: int = 64,
+    ):
+        self._w3 = w3
+        self.chunk_size = chunk_size
+        self.confirmations = confirmations
+        self.reorg_depth = reorg_depth
+        self._factory = get_account_factory()
+        account_events = w3.eth.contract(abi=account_abi).events
+        self._topics = {
+            HexBytes(event_abi_to_log_topic(event.abi)): event
+            for event in (
+                self._factory.events.AccountInitialized(),
+                account_events.SignerChanged(),
+                account_events.Upgraded(),
+            )
+        }
+
+    async def _find_deploy_block(self) -> int:
+        """
+        First block with the factory code, binary searched with eth_getCode
+        """
+        low, high = 0, await self._w3.eth.block_number
+        while low < high:
+            middle = (low + high) // 2
+            if await self._w3.eth.get_code(self._factory.address, middle):
+                high = middle
+            else:
+                low = middle + 1
+        logger.info(f"Account factory {self._factory.address} deployed at block {low}")
+        return low
+
+    async def start_block(self) -> int:
+        start_block = int(facts.config("indexer_start_block", 0) or 0)
+        if start_block:
+            return start_block
+        return await facts.get(f"factory_deploy_block:{self._factory.address}", self._find_deploy_block)
+
+    async def _get_checkpoint(self) -> IndexerCheckpoint:
+        start_block = await self.start_block()
+        try:
+            checkpoint = await IndexerCheckpoint.objects.aget(name=self.name)
+        except IndexerCheckpoint.DoesNotExist:
+            return IndexerCheckpoint(name=self.name, block_number=start_block - 1, block_hash="")
+
+        if checkpoint.block_hash:
+            block = await self._w3.eth.get_block(checkpoint.block_number)
+            if block["hash"].to_0x_hex() != checkpoint.block_hash:
+                logger.warning(f"Reorg detected at block {checkpoint.block_number}, rewinding {self.reorg_depth} blocks")
+                checkpoint.block_number = max(checkpoint.block_number - self.reorg_depth, start_block - 1)
+                checkpoint.block_hash = ""
+                await self._rewind(checkpoint.block_number)
+        return checkpoint
+
+    async def _rewind(self, block_number: int) -> None:
+        """
+        Accounts are users, so changes indexed from orphaned blocks are not deleted
+        but re-read from the chain as of `block_number`, the replayed blocks apply the canonical events again
+        """
+        accounts = [account async for account in Account.objects.filter(indexed_block__gt=block_number)]
+        if not accounts:
+            return
+        signers, implementations = await asyncio.gather(
+            self._factory.read_many(
+                [get_account(account.contract_address).function("signer") for account in accounts],
+                block_number,
+            ),
+            asyncio.gather(*(
+                self._w3.eth.get_storage_at(account.contract_address, IMPLEMENTATION_SLOT, block_number)
+                for account in accounts
+            )),
+        )
+        for account, signer, implementation in zip(accounts, signers, implementations):
+            values = {"indexed_block": block_number}
+            if signer.success:
+                values["signer"] = signer.value
+            if any(implementation):
+                values["implementation"] = "0x" + bytes(implementation)[-20:].hex()
+            await self._update(Account.objects.filter(id=account.id), **values)
+        logger.info(f"Re-read {len(accounts)} accounts changed after block {block_number}")
+
+    async def _get_logs(self, from_block: int, to_block: int) -> list[LogReceipt]:
+        factory_topic, *account_topics = (topic.to_0x_hex() for topic in self._topics)
+        factory_logs = await self._w3.eth.get_logs({
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "address": self._factory.address,
+            "topics": [factory_topic],
+        })
+        # wallets created in this range can emit events right away
+        created = await self._created_addresses(self._decode(factory_logs))
+        addresses = sorted({address.lower() for address in created} | {
+            address.lower()
+            async for address in Account.objects.filter(contract_address__isnull=False).values_list(
+                "contract_address", flat=True
+            )
+        })
+        # an empty address filter would match every contract on the chain
+        account_logs = await asyncio.gather(*(
+            self._w3.eth.get_logs({
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "address": [self._w3.to_checksum_address(address) for address in addresses[i:i + ADDRESS_CHUNK]],
+                "topics": [account_topics],
+            })
+            for i in range(0, len(addresses), ADDRESS_CHUNK)
+        ))
+        return sorted(
+            [*factory_logs, *(log for logs in account_logs for log in logs)],
+            key=lambda log: (log["blockNumber"], log["logIndex"]),
+        )
+
+    async def _created_addresses(self, events: list) -> list[str]:
+        created = [event["args"] for event in events if event["event"] == "AccountInitialized"]
+        return await self._factory.compute_addresses(
+            [(args["signer"], args["recovery_signer"], args["_id"]) for args in created]
+        )
+
+    def _decode(self, logs: list[LogReceipt]) -> list:
+        events = []
+        for log in logs:
+            try:
+                events.append(self._topics[log["topics"][0]].process_log(log))
+            except Exception as e:
+                # a foreign contract emitting the same topic must not stall the sync
+                logger.warning(f"Skipping undecodable log {log['transactionHash'].to_0x_hex()}:{log['logIndex']}: {e}")
+        return events
+
+    async def _apply(self, logs: list[LogReceipt]) -> None:
+        events = self._decode(logs)
+        addresses = iter(await self._created_addresses(events))
+
+        for event in events:
+            args: dict[str, Any] = event["args"]
+            if event["event"] == "AccountInitialized":
+                await self._update(
+                    Account.objects.filter(
+                        signer=args["signer"],
+                        recovery_signer=args["recovery_signer"],
+                        contract_address__isnull=True,
+                    ),
+                    contract_address=next(addresses),
+                    indexed_block=event["blockNumber"],
+                )
+            elif event["event"] == "SignerChanged":
+                await self._update(
+                    Account.objects.filter(contract_address=event["address"]),
+                    signer=args["newSigner"],
+                    indexed_block=event["blockNumber"],
+                )
+            elif event["event"] == "Upgraded":
+                await self._update(
+                    Account.objects.filter(contract_address=event["address"]),
+                    implementation=args["implementation"],
+                    indexed_block=event["blockNumber"],
+                )
+
+    @staticmethod
+    async def _update(queryset, **values) -> None:
+        """
+        Bulk updates skip model signals, so cached wallet lookups are dropped here
+        """
+        accounts = [account async for account in queryset]
+        if not accounts:
+            return
+        try:
+            await queryset.aupdate(**values)
+        except IntegrityError as e:
+            # e.g. a key rotated to a signer of another account, the event is skipped instead of halting the sync
+            logger.error(f"Could not update accounts {[account.id for account in accounts]} with {values}: {e}")
+            return
+        for account in accounts:
+            for field, value in values.items():
+                setattr(account, field, value)
+        await wallets.ainvalidate(*accounts)
+
+    async def sync(self) -> int:
+        """
+        Indexes all blocks up to the confirmed head, returns the number of processed blocks
+        """
+        checkpoint = await self._get_checkpoint()
+        head = await self._w3.eth.block_number - self.confirmations
+        processed = 0
+        while checkpoint.block_number < head:
+            from_block = checkpoint.block_number + 1
+            to_block = min(from_block + self.chunk_size - 1, head)
+            logs, block = await asyncio.gather(
+                self._get_logs(from_block, to_block),
+                self._w3.eth.get_block(to_block),
+            )
+            await self._apply(logs)
+            checkpoint.block_number = to_block
+            checkpoint.block_hash = block["hash"].to_0x_hex()
+            await checkpoint.asave()
+            processed += to_block - from_block + 1
+            logger.info(f"Indexed blocks {from_block}-{to_block}: {len(logs)} events")
+        return processed
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from eth_account import Account as EthAccount
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound
+
+from blockchain.eth.provider import provider
+from blockchain.eth.utils.fee_oracle import get_fee_oracle
+from processing.models import OutgoingTransaction
+from processing.outbox import to_json_params
+
+
+logger = logging.getLogger(__name__)
+
+# nodes reject replacements that raise fees by less than 10%
+FEE_BUMP_PERCENT = 12
+RECEIPT_FIELDS = ("transactionHash", "blockHash", "blockNumber", "status", "gasUsed", "effectiveGasPrice")
+
+
+def bump_fees(params: dict, fees: dict) -> dict:
+    """
+    Fees of a replacement: at least FEE_BUMP_PERCENT above the stuck transaction and not below the current ones
+    """
+    bumped = {}
+    for field in ("maxFeePerGas", "maxPriorityFeePerGas", "gasPrice"):
+        if field in params:
+            bumped[field] = max(int(params[field]) * (100 + FEE_BUMP_PERCENT) // 100 + 1, int(fees.get(field, 0)))
+    if "maxFeePerGas" in bumped:
+        bumped["maxFeePerGas"] = max(bumped["maxFeePerGas"], bumped["maxPriorityFeePerGas"])
+    return bumped
+
+
+def _receipt_to_json(receipt) -> dict:
+    return {
+        field: HexBytes(receipt[field]).to_0x_hex() if isinstance(receipt[field], bytes) else receipt[field]
+        for field in RECEIPT_FIELDS
+        if field in receipt
+    }
+
+
+class OutboxWorker:
+    """
+    Follows pending outbox transactions until they are mined.
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several workers never check the same transaction.
+    Transactions pending longer than `stuck_after` are re-signed with the same nonce and bumped fees,
+    younger ones are rebroadcast in case a node dropped them.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        private_keys: list[str],
+        check_interval: float = 15,
+        stuck_after: float = 60,
+        max_replacements: int = 10,
+        batch_size: int = 50,
+    ):
+        self._w3 = w3
+        self._keys = {EthAccount.from_key(key).address.lower(): key for key in private_keys if key}
+        self.check_interval = timedelta(seconds=check_interval)
+        self.stuck_after = timedelta(seconds=stuck_after)
+        self.max_replacements = max_replacements
+        self.batch_size = batch_size
+
+    def _claim(self) -> list[OutgoingTransaction]:
+        now = timezone.now()
+        with transaction.atomic():
+            claimed = list(
+                OutgoingTransaction.objects.select_for_update(skip_locked=True)
+                .filter(status=OutgoingTransaction.Status.PENDING, next_check_at__lte=now)
+                .order_by("next_check_at")[:self.batch_size]
+            )
+            # pushing the next check out keeps the rows away from other workers once the lock is released
+            OutgoingTransaction.objects.filter(id__in=[tx.id for tx in claimed]).update(
+                next_check_at=now + self.check_interval
+            )
+        return claimed
+
+    async def run_once(self) -> int:
+        claimed = await sync_to_async(self._claim)()
+        await asyncio.gather(*(self._check(tx) for tx in claimed))
+        return len(claimed)
+
+    async def _receipt(self, tx_hash: str):
+        try:
+            return await self._w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+
+    async def _check(self, tx: OutgoingTransaction) -> None:
+        try:
+            # the nonce is read first, so a transaction mined in between is still found by its receipt
+            mined_nonce = await self._w3.eth.get_transaction_count(self._w3.to_checksum_address(tx.sender))
+            receipts = await asyncio.gather(*(self._receipt(tx_hash) for tx_hash in tx.hashes))
+            if receipt := next((receipt for receipt in receipts if receipt), None):
+                await self._finish(tx, receipt)
+            elif mined_nonce > tx.nonce:
+                tx.status = OutgoingTransaction.Status.DROPPED
+                tx.error = "nonce used by another transaction"
+                logger.warning(f"Outbox transaction {tx.tx_hash} dropped, nonce {tx.nonce} of {tx.sender} is used")
+            elif timezone.now() - tx.sent_at >= self.stuck_after and tx.replacements < self.max_replacements:
+                await self._replace(tx)
+            else:
+                await self._rebroadcast(tx)
+        except Exception as e:
+            logger.error(f"Error checking outbox transaction {tx.tx_hash}: {e}")
+        tx.next_check_at = timezone.now() + self.check_interval
+        await tx.asave()
+
+    async def _finish(self, tx: OutgoingTransaction, receipt) -> None:
+        tx.receipt = _receipt_to_json(receipt)
+        if receipt["status"]:
+            tx.status = OutgoingTransaction.Status.CONFIRMED
+        else:
+            tx.status = OutgoingTransaction.Status.FAILED
+            tx.error = "execution reverted"
+        logger.info(f"Outbox transaction {tx.tx_hash} {tx.status} in block {receipt['blockNumber']}")
+
+    async def _rebroadcast(self, tx: OutgoingTransaction) -> None:
+        try:
+            await self._w3.eth.send_raw_transaction(bytes(tx.raw_tx))
+        except Exception as e:
+            # "already known" is the usual answer for a transaction that is still in the mempool
+            logger.debug(f"Rebroadcast of {tx.hashes[-1]}: {e}")
+
+    async def _replace(self, tx: OutgoingTransaction) -> None:
+        private_key = self._keys.get(tx.sender.lower())
+        if private_key is None:
+            logger.error(f"No key to replace outbox transaction {tx.tx_hash} of {tx.sender}")
+            return
+        fees = bump_fees(tx.params, await get_fee_oracle(self._w3).get_fees())
+        params = {**tx.params, **fees}
+        signed_txn = self._w3.eth.account.sign_transaction(params, private_key)
+        await self._w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = signed_txn.hash.to_0x_hex()
+        logger.info(f"Outbox transaction {tx.tx_hash} replaced by {tx_hash} with fees {fees}")
+        tx.params = to_json_params(params)
+        tx.raw_tx = bytes(signed_txn.raw_transaction)
+        tx.hashes = [*tx.hashes, tx_hash]
+        tx.replacements += 1
+        tx.sent_at = timezone.now()
+
+
+def get_outbox_worker(**kwargs) -> OutboxWorker:
+    return OutboxWorker(provider, [settings.PRIVATE_KEY, *settings.RELAYER_PRIVATE_KEYS], **kwargs)
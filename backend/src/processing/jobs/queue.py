@@ -0,0 +1,83 @@
+import json
+import time
+from typing import Optional
+
+from cache import aredis
+from cache.provider import AsyncRedisOverride
+
+
+# KEYS[1] - delayed zset, KEYS[2] - queue, ARGV[1] - now
+PROMOTE_SCRIPT = """
+local jobs = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, job in ipairs(jobs) do
+    redis.call('ZREM', KEYS[1], job)
+    redis.call('LPUSH', KEYS[2], job)
+end
+return #jobs
+"""
+
+# KEYS[1] - processing list, KEYS[2] - queue, KEYS[3] - claim times, ARGV[1] - now, ARGV[2] - lease
+RESTORE_SCRIPT = """
+local restored = 0
+for _, job in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    local claimed_at = redis.call('HGET', KEYS[3], job)
+    if not claimed_at then
+        -- popped right now or by a worker that crashed before recording the claim
+        redis.call('HSET', KEYS[3], job, ARGV[1])
+    elseif tonumber(claimed_at) <= tonumber(ARGV[1]) - tonumber(ARGV[2]) then
+        redis.call('LREM', KEYS[1], 1, job)
+        redis.call('HDEL', KEYS[3], job)
+        redis.call('RPUSH', KEYS[2], job)
+        restored = restored + 1
+    end
+end
+return restored
+"""
+
+
+class JobQueue:
+    """
+    Reliable Redis list queue: popped jobs stay in a processing list until acked.
+    A popped job is leased for `lease` seconds, after that `restore` hands it to another worker.
+    """
+
+    def __init__(self, name: str, cache: AsyncRedisOverride = aredis, lease: float = 600):
+        self.name = name
+        self.lease = lease
+        self._redis = cache.redis
+        self._queue = f"queue:{name}"
+        self._processing = f"queue:{name}:processing"
+        self._delayed = f"queue:{name}:delayed"
+        self._claims = f"queue:{name}:claims"
+        self._promote_script = self._redis.register_script(PROMOTE_SCRIPT)
+        self._restore_script = self._redis.register_script(RESTORE_SCRIPT)
+
+    async def push(self, job: dict, delay: float = 0) -> None:
+        if delay > 0:
+            await self._redis.zadd(self._delayed, {json.dumps(job): time.time() + delay})
+        else:
+            await self._redis.lpush(self._queue, json.dumps(job))
+
+    async def pop(self, timeout: float = 1) -> Optional[tuple[bytes, dict]]:
+        await self._promote_script(keys=[self._delayed, self._queue], args=[time.time()])
+        raw = await self._redis.blmove(self._queue, self._processing, timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        await self._redis.hset(self._claims, raw, time.time())
+        return raw, json.loads(raw)
+
+    async def ack(self, raw: bytes) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            await pipe.lrem(self._processing, 1, raw).hdel(self._claims, raw).execute()
+
+    async def restore(self) -> int:
+        """
+        Moves jobs whose lease expired, i.e. left by a crashed worker, back to the queue.
+        Jobs of running workers stay, so it is safe to call while other workers run.
+        """
+        return await self._restore_script(
+            keys=[self._processing, self._queue, self._claims], args=[time.time(), self.lease]
+        )
+
+    async def size(self) -> int:
+        return await self._redis.llen(self._queue)
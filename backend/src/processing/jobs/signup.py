@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from collections import defaultdict, deque
+
+from django.conf import settings
+
+from blockchain.eth.contracts import get_account_factory, get_rub
+from blockchain.eth.provider import provider
+from blockchain.eth.utils.receipt_watcher import get_receipt_watcher
+from processing.jobs.queue import JobQueue
+from processing.models import Account
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 5
+FAUCET_AMOUNT = 1000
+
+signup_queue = JobQueue("signup")
+
+
+async def enqueue_sign_up(account: Account, attempt: int = 0) -> None:
+    await signup_queue.push({"account_id": account.id, "attempt": attempt}, delay=RETRY_DELAY * attempt)
+
+
+def _user_key(signer: str, recovery_signer: str) -> tuple[str, str]:
+    return provider.to_checksum_address(signer), provider.to_checksum_address(recovery_signer)
+
+
+async def deploy(accounts: list[Account]) -> None:
+    """
+    Deploys new accounts with one `createAccounts` transaction and resolves addresses of all of them
+    """
+    contract = get_account_factory()
+    new_accounts = [account for account in accounts if account.deploy_txid is None]
+    if new_accounts:
+        txid = await contract.create_accounts(
+            [(account.signer, account.recovery_signer) for account in new_accounts],
+        )
+        for account in new_accounts:
+            account.deploy_txid = txid.to_0x_hex()
+        await Account.objects.filter(id__in=[account.id for account in new_accounts]).aupdate(
+            deploy_txid=txid.to_0x_hex()
+        )
+        logger.info(f"Deployment of {len(new_accounts)} accounts sent with txid: {txid.to_0x_hex()}")
+
+    batches = defaultdict(list)
+    for account in accounts:
+        batches[account.deploy_txid].append(account)
+    for txid, batch in batches.items():
+        try:
+            await _resolve_batch(contract, txid, batch)
+        except Exception as e:
+            logger.error(f"Error resolving deployment {txid}: {e}")
+
+
+async def _resolve_batch(contract, txid: str, accounts: list[Account]) -> None:
+    receipt = await get_receipt_watcher(provider).wait(txid)
+    if not receipt["status"]:
+        await Account.objects.filter(id__in=[account.id for account in accounts]).aupdate(deploy_txid=None)
+        for account in accounts:
+            account.deploy_txid = None
+        raise RuntimeError(f"Account deployment reverted: {txid}")
+
+    deployed = defaultdict(deque)
+    for signer, recovery_signer, address in await contract.compute_addresses_from_receipt(receipt):
+        deployed[signer, recovery_signer].append(address)
+    for account in accounts:
+        addresses = deployed[_user_key(account.signer, account.recovery_signer)]
+        if not addresses:
+            logger.error(f"Account {account.email} not found in deployment {txid}")
+            continue
+        account.contract_address = addresses.popleft()
+        account.status = Account.Status.DEPLOYED
+        await account.asave(update_fields=["contract_address", "status"])
+        logger.info(f"Account {account.email} deployed at {account.contract_address}")
+
+
+async def fund(account: Account) -> None:
+    try:
+        rub_contract = get_rub()
+        txid = await rub_contract.transfer(
+            to_address=account.contract_address,
+            amount=await rub_contract.to_decimals(FAUCET_AMOUNT),
+            private_key=settings.PRIVATE_KEY
+        )
+        logger.info(f"Transfer txid: {txid.to_0x_hex()}")
+        account.status = Account.Status.ACTIVE
+        await account.asave(update_fields=["status"])
+    except Exception as e:
+        logger.error(f"Error funding account {account.email}: {e}")
+
+
+async def process_sign_ups(jobs: list[dict]) -> None:
+    accounts = {
+        account.id: account
+        async for account in Account.objects.filter(id__in=[job["account_id"] for job in jobs])
+    }
+    pending = [account for account in accounts.values() if account.status == Account.Status.PENDING]
+    if pending:
+        try:
+            await deploy(pending)
+        except Exception as e:
+            logger.error(f"Error deploying {len(pending)} accounts: {e}")
+
+    await asyncio.gather(*(
+        fund(account) for account in accounts.values() if account.status == Account.Status.DEPLOYED
+    ))
+
+    for job in jobs:
+        account = accounts.get(job["account_id"])
+        if account is None or account.status not in (Account.Status.PENDING, Account.Status.DEPLOYED):
+            continue
+        attempt = job["attempt"] + 1
+        if attempt < MAX_ATTEMPTS:
+            await enqueue_sign_up(account, attempt)
+        else:
+            # a deployed account that could not be funded fails too, instead of staying DEPLOYED unnoticed
+            logger.error(f"Sign-up of {account.email} failed after {attempt} attempts in status {account.status}")
+            account.status = Account.Status.FAILED
+            await account.asave(update_fields=["status"])
@@ -0,0 +1,57 @@
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from blockchain.eth.contracts import get_rub
+from blockchain.eth.contracts.absctract.tokens import ERC20
+from blockchain.eth.provider import provider
+from processing.models import Account, BalanceSnapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+async def prune_balance_snapshots(token: str, keep: BalanceSnapshot) -> int:
+    """
+    Deletes snapshots of `token` older than BALANCE_SNAPSHOT_RETENTION days, `keep` always stays
+    """
+    if not settings.BALANCE_SNAPSHOT_RETENTION:
+        return 0
+    expired_before = timezone.now() - timedelta(days=settings.BALANCE_SNAPSHOT_RETENTION)
+    deleted, _ = await BalanceSnapshot.objects.filter(token=token, created_at__lt=expired_before).exclude(
+        id=keep.id
+    ).adelete()
+    if deleted:
+        logger.info(f"Deleted {deleted} balance snapshots of {token} taken before {expired_before}")
+    return deleted
+
+
+async def take_balance_snapshot(token: Optional[ERC20] = None, block_number: Optional[int] = None) -> BalanceSnapshot:
+    """
+    Reads balances of every deployed account at one pinned block with batched multicalls
+    """
+    token = token or get_rub()
+    block = await provider.eth.get_block("latest" if block_number is None else block_number)
+    addresses = [
+        address async for address in Account.objects.filter(contract_address__isnull=False)
+        .order_by("id")
+        .values_list("contract_address", flat=True)
+    ]
+    balances = await token.balances_of(addresses, block["number"])
+    snapshot = await BalanceSnapshot.objects.acreate(
+        token=token.address,
+        block_number=block["number"],
+        block_hash=block["hash"].to_0x_hex(),
+        count=len(addresses),
+        failed=balances.count(None),
+        data=BalanceSnapshot.pack(list(zip(addresses, balances))),
+    )
+    logger.info(
+        f"Balance snapshot {snapshot.id} of {token.address} at block {snapshot.block_number}: "
+        f"{snapshot.count} accounts, {snapshot.failed} failed"
+    )
+    await prune_balance_snapshots(token.address, snapshot)
+    return snapshot
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.core.management import BaseCommand
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+CONNECTIONS_QUERY = """
+SELECT count(*), count(*) FILTER (WHERE state = 'active')
+FROM pg_stat_activity
+WHERE datname = current_database() AND pid <> pg_backend_pid()
+"""
+
+
+class Command(BaseCommand):
+    help = "Sends concurrent requests to an uncached DB-backed endpoint and samples Postgres connection counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://backend:8000/api/account/sign-up-status/load-test@example.com")
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--sample-interval", type=float, default=0.5)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options["url"], options["concurrency"], options["requests"], options["sample_interval"]))
+
+    @staticmethod
+    def _count_connections() -> tuple[int, int]:
+        with connection.cursor() as cursor:
+            cursor.execute(CONNECTIONS_QUERY)
+            return cursor.fetchone()
+
+    async def _sample(self, interval: float, samples: list[tuple[int, int]]):
+        count_connections = sync_to_async(self._count_connections)
+        while True:
+            samples.append(await count_connections())
+            await asyncio.sleep(interval)
+
+    async def run(self, url: str, concurrency: int, requests: int, sample_interval: float):
+        samples: list[tuple[int, int]] = []
+        statuses: dict[int, int] = {}
+        remaining = iter(range(requests))
+
+        async def worker(client: httpx.AsyncClient):
+            for _ in remaining:
+                try:
+                    code = (await client.get(url)).status_code
+                except httpx.HTTPError:
+                    code = 0
+                statuses[code] = statuses.get(code, 0) + 1
+
+        baseline = await sync_to_async(self._count_connections)()
+        sampler = asyncio.create_task(self._sample(sample_interval, samples))
+        started = time.monotonic()
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+        sampler.cancel()
+
+        totals = [total for total, _ in samples] or [baseline[0]]
+        self.stdout.write(f"{requests} requests, concurrency {concurrency}: {requests / elapsed:.0f} req/s")
+        self.stdout.write(f"Responses: {dict(sorted(statuses.items()))}")
+        self.stdout.write(f"Postgres connections: baseline {baseline[0]}, min {min(totals)}, max {max(totals)}")
+        self.stdout.write(f"Active connections peak: {max((active for _, active in samples), default=0)}")
@@ -3,7 +3,7 @@ import logging
 
 from django.core.management import BaseCommand
 
-from cache import redis
+from cache import facts, redis
 
 
 logger = logging.getLogger(__name__)
@@ -16,5 +16,6 @@ class Command(BaseCommand):
 
         for key, value in config.items():
             redis.set(key, value)
+        facts.invalidate()
 
         logger.info('Config set successfully')
@@ -0,0 +1,32 @@
+import asyncio
+import logging
+
+from django.core.management import BaseCommand
+
+from blockchain.eth.provider import provider
+from processing.jobs.indexer import AccountIndexer
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Mirrors account factory and smart wallet events into the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=5)
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--confirmations", type=int, default=12)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options["interval"], options["chunk_size"], options["confirmations"]))
+
+    @staticmethod
+    async def run(interval: float, chunk_size: int, confirmations: int):
+        indexer = AccountIndexer(provider, chunk_size=chunk_size, confirmations=confirmations)
+        while True:
+            try:
+                await indexer.sync()
+            except Exception as e:
+                logger.error(f"Error indexing accounts: {e}")
+            await asyncio.sleep(interval)
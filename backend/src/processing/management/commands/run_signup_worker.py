@@ -0,0 +1,68 @@
+import asyncio
+import logging
+
+from django.core.management import BaseCommand
+
+from processing.jobs.signup import process_sign_ups, signup_queue
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deploys, resolves and funds accounts queued by sign-up"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=2)
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument("--batch-window", type=float, default=2.0)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options["concurrency"], options["batch_size"], options["batch_window"]))
+
+    async def run(self, concurrency: int, batch_size: int, batch_window: float):
+        logger.info(f"Sign-up worker started: concurrency {concurrency}, batch {batch_size}/{batch_window}s")
+        await asyncio.gather(self.restore(), *(self.consume(batch_size, batch_window) for _ in range(concurrency)))
+
+    @staticmethod
+    async def restore():
+        """
+        Re-enqueues jobs of crashed workers once their lease expires
+        """
+        while True:
+            try:
+                if restored := await signup_queue.restore():
+                    logger.info(f"Restored {restored} unfinished sign-up jobs")
+            except Exception as e:
+                logger.error(f"Error restoring sign-up jobs: {e}")
+            await asyncio.sleep(signup_queue.lease / 4)
+
+    @staticmethod
+    async def collect(batch_size: int, batch_window: float) -> list[tuple[bytes, dict]]:
+        """
+        Waits for the first job, then gathers more until the batch is full or the window closes
+        """
+        item = await signup_queue.pop()
+        if item is None:
+            return []
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + batch_window
+        while len(batch) < batch_size and (remaining := deadline - loop.time()) > 0:
+            item = await signup_queue.pop(remaining)
+            if item is not None:
+                batch.append(item)
+        return batch
+
+    async def consume(self, batch_size: int, batch_window: float):
+        while True:
+            batch = await self.collect(batch_size, batch_window)
+            if not batch:
+                continue
+            try:
+                await process_sign_ups([job for _, job in batch])
+            except Exception as e:
+                logger.error(f"Error processing sign-up batch: {e}")
+            finally:
+                for raw, _ in batch:
+                    await signup_queue.ack(raw)
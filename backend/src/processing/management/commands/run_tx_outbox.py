@@ -0,0 +1,36 @@
+import asyncio
+import logging
+
+from django.core.management import BaseCommand
+
+from processing.jobs.outbox import get_outbox_worker
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Tracks outbox transactions until they are mined, rebroadcasts and replaces stuck ones by fee"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=5)
+        parser.add_argument("--check-interval", type=float, default=15)
+        parser.add_argument("--stuck-after", type=float, default=60)
+        parser.add_argument("--batch-size", type=int, default=50)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options["interval"], options["check_interval"], options["stuck_after"], options["batch_size"]))
+
+    @staticmethod
+    async def run(interval: float, check_interval: float, stuck_after: float, batch_size: int):
+        worker = get_outbox_worker(check_interval=check_interval, stuck_after=stuck_after, batch_size=batch_size)
+        logger.info(f"Outbox worker started: stuck after {stuck_after}s, check every {check_interval}s")
+        while True:
+            try:
+                claimed = await worker.run_once()
+            except Exception as e:
+                logger.error(f"Error processing outbox: {e}")
+                claimed = 0
+            # a full batch means more transactions are due
+            if claimed < batch_size:
+                await asyncio.sleep(interval)
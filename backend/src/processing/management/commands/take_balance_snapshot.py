@@ -0,0 +1,34 @@
+import asyncio
+import logging
+
+from django.core.management import BaseCommand
+
+from processing.jobs.snapshot import take_balance_snapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stores RUB balances of all deployed accounts at a pinned block, repeats every --interval seconds if set. "
+        "Snapshots older than BALANCE_SNAPSHOT_RETENTION days are deleted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--block", type=int, default=None)
+        parser.add_argument("--interval", type=float, default=0)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options["block"], options["interval"]))
+
+    @staticmethod
+    async def run(block: int, interval: float):
+        while True:
+            try:
+                await take_balance_snapshot(block_number=block)
+            except Exception as e:
+                logger.error(f"Error taking balance snapshot: {e}")
+            if not interval:
+                return
+            await asyncio.sleep(interval)
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('deployed', 'Deployed'), ('active', 'Active'), ('failed', 'Failed')], default='active', max_length=16),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='account',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('deployed', 'Deployed'), ('active', 'Active'), ('failed', 'Failed')], default='pending', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='deploy_txid',
+            field=models.CharField(blank=True, max_length=66, null=True),
+        ),
+    ]
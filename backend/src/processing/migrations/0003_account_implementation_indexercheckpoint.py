@@ -0,0 +1,28 @@
+# Generated by Django 5.0.2 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processing', '0002_account_status_account_deploy_txid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='implementation',
+            field=models.CharField(blank=True, max_length=42, null=True),
+        ),
+        migrations.CreateModel(
+            name='IndexerCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('block_number', models.BigIntegerField()),
+                ('block_hash', models.CharField(max_length=66)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
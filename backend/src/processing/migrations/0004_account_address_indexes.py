@@ -0,0 +1,93 @@
+# Generated by Django 5.0.2 on 2026-10-18 06:36
+
+import django.contrib.postgres.indexes
+import helpers.models.fields.address_field
+import logging
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+logger = logging.getLogger(__name__)
+
+
+def _duplicates(accounts, field):
+    groups = defaultdict(list)
+    for account in accounts:
+        if getattr(account, field):
+            groups[getattr(account, field)].append(account)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def lowercase_addresses(apps, schema_editor):
+    """
+    Lowercases addresses before signer and contract_address become unique.
+    Duplicate sign-ups of a signer that never got a wallet are dropped in favour of the one that did,
+    or the oldest one. Any other conflict is reported and stops the migration for manual resolution.
+    """
+    Account = apps.get_model("processing", "Account")
+    Account.objects.update(
+        contract_address=Lower("contract_address"),
+        signer=Lower("signer"),
+        recovery_signer=Lower("recovery_signer"),
+        implementation=Lower("implementation"),
+    )
+
+    accounts = list(Account.objects.order_by("id"))
+    redundant = []
+    for group in _duplicates(accounts, "signer"):
+        kept = next((account for account in group if account.contract_address), group[0])
+        redundant += [
+            account
+            for account in group
+            if account is not kept and not account.contract_address and account.status in ("pending", "failed")
+        ]
+    for account in redundant:
+        logger.warning(f"Removing duplicate sign-up {account.id} ({account.email}) of signer {account.signer}")
+    Account.objects.filter(id__in=[account.id for account in redundant]).delete()
+
+    removed = {account.id for account in redundant}
+    accounts = [account for account in accounts if account.id not in removed]
+    conflicts = [
+        f"{field} {getattr(group[0], field)}: accounts {', '.join(str(account.id) for account in group)}"
+        for field in ("signer", "contract_address")
+        for group in _duplicates(accounts, field)
+    ]
+    if conflicts:
+        raise RuntimeError("Duplicate accounts must be resolved before migrating:\n" + "\n".join(conflicts))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processing', '0003_account_implementation_indexercheckpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_addresses, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='account',
+            name='contract_address',
+            field=helpers.models.fields.address_field.AddressField(blank=True, max_length=42, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='account',
+            name='implementation',
+            field=helpers.models.fields.address_field.AddressField(blank=True, max_length=42, null=True),
+        ),
+        migrations.AlterField(
+            model_name='account',
+            name='recovery_signer',
+            field=helpers.models.fields.address_field.AddressField(max_length=42),
+        ),
+        migrations.AlterField(
+            model_name='account',
+            name='signer',
+            field=helpers.models.fields.address_field.AddressField(max_length=42, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['helper'], name='account_helper_hash'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-18 06:41
+
+import helpers.models.fields.address_field
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processing', '0004_account_address_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', helpers.models.fields.address_field.AddressField(max_length=42)),
+                ('block_number', models.BigIntegerField()),
+                ('block_hash', models.CharField(max_length=66)),
+                ('count', models.IntegerField()),
+                ('failed', models.IntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', '-block_number'], name='balance_snapshot_latest')],
+            },
+        ),
+    ]
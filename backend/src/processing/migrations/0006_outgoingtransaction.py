@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-18 06:47
+
+import helpers.models.fields.address_field
+import helpers.models.fields.json_field
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processing', '0005_balancesnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sender', helpers.models.fields.address_field.AddressField(max_length=42)),
+                ('nonce', models.BigIntegerField()),
+                ('tx_hash', models.CharField(max_length=66, unique=True)),
+                ('hashes', helpers.models.fields.json_field.JSONField()),
+                ('params', helpers.models.fields.json_field.JSONField()),
+                ('raw_tx', models.BinaryField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('failed', 'Failed'), ('dropped', 'Dropped')], default='pending', max_length=16)),
+                ('replacements', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('receipt', helpers.models.fields.json_field.JSONField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField()),
+                ('next_check_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_check_at'], name='outbox_due'), models.Index(fields=['sender', 'nonce'], name='outbox_sender_nonce')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processing', '0006_outgoingtransaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='indexed_block',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,9 +1,118 @@
+from typing import Optional
+
+from django.contrib.postgres.indexes import HashIndex
 from django.db import models
 
+from helpers.models.fields.address_field import AddressField
+from helpers.models.fields.json_field import JSONField
+
 
 class Account(models.Model):
-    contract_address = models.CharField(max_length=255, null=True, blank=True)
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        DEPLOYED = "deployed"
+        ACTIVE = "active"
+        FAILED = "failed"
+
+    contract_address = AddressField(unique=True, null=True, blank=True)
     email = models.EmailField(unique=True)
-    signer = models.CharField(max_length=255)
-    recovery_signer = models.CharField(max_length=255)
+    signer = AddressField(unique=True)
+    recovery_signer = AddressField()
     helper = models.TextField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    deploy_txid = models.CharField(max_length=66, null=True, blank=True)
+    implementation = AddressField(null=True, blank=True)
+    # block of the last change applied by the indexer, re-read from the chain on a reorg
+    indexed_block = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # helper is an arbitrary length blob only ever matched by equality
+            HashIndex(fields=["helper"], name="account_helper_hash"),
+        ]
+
+
+class IndexerCheckpoint(models.Model):
+    name = models.CharField(max_length=64, unique=True)
+    block_number = models.BigIntegerField()
+    block_hash = models.CharField(max_length=66)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class BalanceSnapshot(models.Model):
+    """
+    Token balances of all deployed accounts at one block.
+    `data` holds ENTRY_SIZE-byte records: 20-byte address followed by a 32-byte big-endian balance
+    """
+
+    ENTRY_SIZE = 52
+    # stored when the balance call failed, not reachable by a real token balance
+    FAILED_BALANCE = 2 ** 256 - 1
+
+    token = AddressField()
+    block_number = models.BigIntegerField()
+    block_hash = models.CharField(max_length=66)
+    count = models.IntegerField()
+    failed = models.IntegerField(default=0)
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["token", "-block_number"], name="balance_snapshot_latest"),
+        ]
+
+    @classmethod
+    def pack(cls, balances: list[tuple[str, Optional[int]]]) -> bytes:
+        return b"".join(
+            bytes.fromhex(address[2:]) + (cls.FAILED_BALANCE if balance is None else balance).to_bytes(32, "big")
+            for address, balance in balances
+        )
+
+    def entries(self, offset: int = 0, limit: Optional[int] = None) -> list[tuple[str, Optional[int]]]:
+        data = bytes(self.data)
+        end = self.count if limit is None else min(offset + limit, self.count)
+        entries = []
+        for index in range(offset, end):
+            entry = data[index * self.ENTRY_SIZE:(index + 1) * self.ENTRY_SIZE]
+            balance = int.from_bytes(entry[20:], "big")
+            entries.append(("0x" + entry[:20].hex(), None if balance == self.FAILED_BALANCE else balance))
+        return entries
+
+
+class OutgoingTransaction(models.Model):
+    """
+    Outbox of signed transactions, tracked until they are mined and replaced by fee while they are stuck
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        CONFIRMED = "confirmed"
+        # reverted on chain or rejected by the node
+        FAILED = "failed"
+        # the nonce was used by a transaction that is not in the outbox
+        DROPPED = "dropped"
+
+    sender = AddressField()
+    nonce = models.BigIntegerField()
+    # hash of the first broadcast, returned to the caller
+    tx_hash = models.CharField(max_length=66, unique=True)
+    # every broadcast hash, the last one is the current replacement
+    hashes = JSONField()
+    # unsigned transaction, re-signed with higher fees on replacement
+    params = JSONField()
+    raw_tx = models.BinaryField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    replacements = models.IntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    receipt = JSONField(null=True, blank=True)
+    sent_at = models.DateTimeField()
+    next_check_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_check_at"], name="outbox_due"),
+            models.Index(fields=["sender", "nonce"], name="outbox_sender_nonce"),
+        ]
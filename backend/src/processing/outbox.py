@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from eth_account.datastructures import SignedTransaction
+from hexbytes import HexBytes
+from web3.types import TxParams
+
+from blockchain.eth.utils.outbox import TransactionOutbox
+from processing.models import OutgoingTransaction
+
+
+# first outbox check of a broadcast transaction
+CHECK_DELAY = timedelta(seconds=15)
+
+
+def to_json_params(transaction: TxParams) -> dict:
+    return {key: HexBytes(value).to_0x_hex() if isinstance(value, bytes) else value for key, value in transaction.items()}
+
+
+class DatabaseOutbox(TransactionOutbox):
+    """
+    Keeps signed transactions in OutgoingTransaction rows, followed by the outbox worker
+    """
+
+    async def record(self, transaction: TxParams, signed_txn: SignedTransaction) -> None:
+        tx_hash = signed_txn.hash.to_0x_hex()
+        now = timezone.now()
+        await OutgoingTransaction.objects.acreate(
+            sender=transaction["from"],
+            nonce=transaction["nonce"],
+            tx_hash=tx_hash,
+            hashes=[tx_hash],
+            params=to_json_params(transaction),
+            raw_tx=bytes(signed_txn.raw_transaction),
+            sent_at=now,
+            next_check_at=now + CHECK_DELAY,
+        )
+
+    async def fail(self, tx_hash: str, error: Exception) -> None:
+        await OutgoingTransaction.objects.filter(tx_hash=tx_hash).aupdate(
+            status=OutgoingTransaction.Status.FAILED, error=str(error)
+        )
+
+    async def hashes(self, tx_hashes: list[str]) -> dict[str, list[str]]:
+        stored = {
+            tx_hash: hashes
+            async for tx_hash, hashes in OutgoingTransaction.objects.filter(tx_hash__in=tx_hashes).values_list(
+                "tx_hash", "hashes"
+            )
+        }
+        return {tx_hash: stored.get(tx_hash) or [tx_hash] for tx_hash in tx_hashes}
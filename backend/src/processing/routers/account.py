@@ -1,24 +1,46 @@
+import asyncio
+import json
 import logging
+from typing import AsyncIterator, Optional
 
-from django.conf import settings
+from django.http import StreamingHttpResponse
 from eth_typing import HexStr
-from eth_utils import add_0x_prefix
+from eth_utils import add_0x_prefix, is_address
 from ninja import Router
 from ninja.responses import codes_4xx, codes_5xx
 from ninja_extra import status
 from pydantic import EmailStr
 
-from blockchain.eth.contracts import get_account
+from blockchain.eth.contracts import SimpleAccount, get_account, get_account_factory, get_rub
+from blockchain.eth.exception import TransactionReverted
 from blockchain.eth.provider import provider
+from blockchain.eth.utils.receipt_watcher import get_receipt_watcher
+from blockchain.eth.utils.relayer_pool import get_relayer_pool
+from blockchain.eth.utils.signatures import verify_execute
 from helpers.schemas.base import JSONResponseException
-from processing.models import Account
-from processing.schemas.account import ExecuteSchema
+from processing.idempotency import idempotency
+from processing.models import Account, BalanceSnapshot
+from processing.schemas.account import (
+    MAX_BALANCES_PAGE,
+    BalanceSchema,
+    BalanceSnapshotSchema,
+    ExecuteSchema,
+    RelayerSchema,
+    SignUpStatusSchema,
+    WalletLookupResultSchema,
+    WalletLookupSchema,
+)
 from processing.schemas.auth import AccountSchema
+from processing.wallets import wallets
 
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+MAX_STATUS_WAIT = 30
+STATUS_POLL_INTERVAL = 0.5
+CHAIN_LOOKUP_CHUNK = 500
+
 
 @router.get(
     "/get-smart-wallet-by-signer/{address}",
@@ -32,14 +54,13 @@ async def get_smart_wallet_by_signer(
     request,
     address: str,
 ):
-    try:
-        account = await Account.objects.aget(signer=address)
-        return status.HTTP_200_OK, AccountSchema.from_orm(account)
-    except Account.DoesNotExist:
+    payload = await wallets.get("signer", address)
+    if payload is None:
         logger.error(f"Error getting smart wallet: {address}")
         return status.HTTP_500_INTERNAL_SERVER_ERROR, JSONResponseException(
             detail="Error getting smart wallet.",
         )
+    return status.HTTP_200_OK, AccountSchema(**payload)
 
 
 @router.get(
@@ -54,14 +75,13 @@ async def get_smart_wallet_by_helper(
     request,
     helper: str,
 ):
-    try:
-        account = await Account.objects.aget(helper=helper)
-        return status.HTTP_200_OK, AccountSchema.from_orm(account)
-    except Account.DoesNotExist:
+    payload = await wallets.get("helper", helper)
+    if payload is None:
         logger.error(f"Error getting smart wallet")
         return status.HTTP_404_NOT_FOUND, JSONResponseException(
             detail="Error getting smart wallet.",
         )
+    return status.HTTP_200_OK, AccountSchema(**payload)
 
 
 @router.get(
@@ -76,14 +96,189 @@ async def get_smart_wallet_by_email(
     request,
     email: EmailStr,
 ):
-    try:
-        account = await Account.objects.aget(email=email)
-        return status.HTTP_200_OK, AccountSchema.from_orm(account)
-    except Account.DoesNotExist:
+    payload = await wallets.get("email", email)
+    if payload is None:
         logger.error(f"Error getting smart wallet")
         return status.HTTP_404_NOT_FOUND, JSONResponseException(
             detail="Error getting smart wallet.",
         )
+    return status.HTTP_200_OK, AccountSchema(**payload)
+
+
+async def _lookup_on_chain(signers: list[str]) -> dict[str, dict]:
+    """
+    Resolves signers missing from the database with one getUserBySigner multicall
+    """
+    try:
+        users = await get_account_factory().get_users_by_signers(signers)
+    except Exception as e:
+        logger.error(f"Error getting users by signers: {e}")
+        return {}
+    found = {}
+    for signer, user in zip(signers, users):
+        if user is None:
+            continue
+        user_signer, recovery_signer, contract_address = user
+        # unknown signers resolve to an empty or unrelated record
+        if user_signer.lower() == signer:
+            found[signer] = {
+                "signer": user_signer,
+                "recovery_signer": recovery_signer,
+                "contract_address": contract_address,
+            }
+    return found
+
+
+async def _lookup_wallets(body: WalletLookupSchema) -> AsyncIterator[str]:
+    yield "["
+    separator = ""
+    for field, values in (
+        ("signer", body.signers),
+        ("email", body.emails),
+        ("helper", body.helpers),
+        ("contract_address", body.contract_addresses),
+    ):
+        accounts = await wallets.get_many(field, values)
+        missing = []
+        for value, account in accounts.items():
+            if account is None and field == "signer" and is_address(value):
+                missing.append(value)
+                continue
+            result = WalletLookupResultSchema(field=field, value=value, source=account and "db", **(account or {}))
+            yield separator + json.dumps(result.dict())
+            separator = ","
+
+        for offset in range(0, len(missing), CHAIN_LOOKUP_CHUNK):
+            chunk = missing[offset:offset + CHAIN_LOOKUP_CHUNK]
+            found = await _lookup_on_chain(chunk)
+            for value in chunk:
+                account = found.get(value)
+                result = WalletLookupResultSchema(field=field, value=value, source=account and "chain", **(account or {}))
+                yield separator + json.dumps(result.dict())
+                separator = ","
+    yield "]"
+
+
+@router.post(
+    "/lookup",
+    response={
+        status.HTTP_200_OK: list[WalletLookupResultSchema],
+        codes_4xx: JSONResponseException,
+        codes_5xx: JSONResponseException,
+    },
+)
+async def lookup_wallets(
+    request,
+    body: WalletLookupSchema,
+):
+    """
+    Resolves up to MAX_LOOKUP_KEYS signers, emails, helpers and contract addresses in one request.
+    Results are streamed as a JSON array, `source` is null for keys that were not found
+    """
+    return StreamingHttpResponse(_lookup_wallets(body), content_type="application/json")
+
+
+@router.get(
+    "/balances",
+    response={
+        status.HTTP_200_OK: BalanceSnapshotSchema,
+        codes_4xx: JSONResponseException,
+        codes_5xx: JSONResponseException,
+    },
+)
+async def get_balances(
+    request,
+    snapshot_id: Optional[int] = None,
+    token: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 100,
+):
+    """
+    Page of a stored balance snapshot, the latest one of `token` (RUB by default) unless `snapshot_id` is given
+    """
+    if token is not None and not is_address(token):
+        return status.HTTP_400_BAD_REQUEST, JSONResponseException(
+            detail="Invalid token address.",
+        )
+    if snapshot_id is not None:
+        snapshots = BalanceSnapshot.objects.filter(id=snapshot_id)
+    else:
+        snapshots = BalanceSnapshot.objects.filter(token=token or get_rub().address).order_by("-block_number", "-id")
+    snapshot = await snapshots.afirst()
+    if snapshot is None:
+        return status.HTTP_404_NOT_FOUND, JSONResponseException(
+            detail="Balance snapshot not found.",
+        )
+
+    offset, limit = max(offset, 0), min(max(limit, 0), MAX_BALANCES_PAGE)
+    return status.HTTP_200_OK, BalanceSnapshotSchema(
+        id=snapshot.id,
+        token=snapshot.token,
+        block_number=snapshot.block_number,
+        block_hash=snapshot.block_hash,
+        created_at=snapshot.created_at,
+        count=snapshot.count,
+        failed=snapshot.failed,
+        offset=offset,
+        limit=limit,
+        balances=[
+            BalanceSchema(address=address, balance=None if balance is None else str(balance))
+            for address, balance in snapshot.entries(offset, limit)
+        ],
+    )
+
+
+@router.get(
+    "/relayers",
+    response={
+        status.HTTP_200_OK: list[RelayerSchema],
+        codes_4xx: JSONResponseException,
+        codes_5xx: JSONResponseException,
+    },
+)
+async def get_relayers(request):
+    """
+    Queue depth of every relayer lane
+    """
+    return status.HTTP_200_OK, [RelayerSchema(**lane) for lane in await get_relayer_pool(provider).queue_depths()]
+
+
+@router.get(
+    "/sign-up-status/{email}",
+    response={
+        status.HTTP_200_OK: SignUpStatusSchema,
+        codes_4xx: JSONResponseException,
+        codes_5xx: JSONResponseException,
+    },
+)
+async def get_sign_up_status(
+    request,
+    email: EmailStr,
+    wait: float = 0,
+):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(max(wait, 0), MAX_STATUS_WAIT)
+    while True:
+        try:
+            account = await Account.objects.aget(email=email)
+        except Account.DoesNotExist:
+            return status.HTTP_404_NOT_FOUND, JSONResponseException(
+                detail="Account not found.",
+            )
+        if account.status != Account.Status.PENDING or loop.time() >= deadline:
+            return status.HTTP_200_OK, SignUpStatusSchema.from_orm(account)
+        await asyncio.sleep(STATUS_POLL_INTERVAL)
+
+
+async def _is_signed_by_owner(contract: SimpleAccount, dest: str, value: int, func: bytes, signature: bytes) -> bool:
+    """
+    Checks the signature off-chain so invalid ones are rejected before a transaction is sent
+    """
+    account = await wallets.get("contract_address", contract.address)
+    if account and verify_execute(dest, value, func, signature, account["signer"]):
+        return True
+    # the stored signer lags behind SignerChanged events that are not indexed yet
+    return verify_execute(dest, value, func, signature, await contract.signer())
 
 
 @router.post(
@@ -99,20 +294,53 @@ async def execute(
     address: str,
     body: ExecuteSchema,
 ):
+    # client retries of the same signed call get the first response instead of a second transaction
+    key = idempotency.key(
+        request,
+        f"execute:{address.lower()}",
+        body.dest.lower(),
+        body.value,
+        body.func.lower().removeprefix("0x"),
+        body.signature.lower().removeprefix("0x"),
+    )
+    return await idempotency.run(key, lambda: _execute(address, body))
+
+
+async def _execute(address: str, body: ExecuteSchema):
     try:
         contract = get_account(address)
+        dest = provider.to_checksum_address(body.dest)
+        func = bytes.fromhex(body.func.replace("0x", ""))
+        signature = bytes.fromhex(body.signature.replace("0x", ""))
+    except ValueError:
+        return status.HTTP_400_BAD_REQUEST, JSONResponseException(
+            detail="Invalid address or calldata.",
+        )
+
+    try:
+        if not await _is_signed_by_owner(contract, dest, body.value, func, signature):
+            logger.warning(f"Rejected execute for {address}: invalid signature")
+            return status.HTTP_400_BAD_REQUEST, JSONResponseException(
+                detail="Invalid signature.",
+            )
         txid = await contract.execute(
-            body.dest,
+            dest,
             body.value,
-            bytes.fromhex(body.func.replace("0x", "")),
-            bytes.fromhex(body.signature.replace("0x", "")),
-            settings.PRIVATE_KEY,
+            func,
+            signature,
         )
-        tx_data = await provider.eth.wait_for_transaction_receipt(txid)
-        print(tx_data)
-        logger.info(f"Transaction executed with txid: {txid.hex()}")
         response = body.get_response_schema()
+        # the call is on its way, a retry with the same key must not send it again
+        await idempotency.checkpoint(status.HTTP_200_OK, response(txid=txid.to_0x_hex()))
+        # the mined transaction may be an outbox replacement with a higher fee
+        txid = (await get_receipt_watcher(provider).wait(txid))["transactionHash"]
+        logger.info(f"Transaction executed with txid: {txid.hex()}")
         return status.HTTP_200_OK, response(txid=add_0x_prefix(HexStr(txid.hex())))
+    except TransactionReverted as e:
+        logger.warning(f"Execute for {address} not sent: {e}")
+        return status.HTTP_400_BAD_REQUEST, JSONResponseException(
+            detail=f"Transaction reverted: {e.reason}",
+        )
     except Exception as e:
         logger.error(f"Error executing transaction: {e}")
         return status.HTTP_500_INTERNAL_SERVER_ERROR, JSONResponseException(
@@ -1,12 +1,75 @@
-from typing import Type
+from datetime import datetime
+from typing import Optional, Type
 
 from ninja import Schema
+from pydantic import model_validator
+
+
+MAX_LOOKUP_KEYS = 5000
+MAX_BALANCES_PAGE = 1000
 
 
 class TxStatusSchema(Schema):
     txid: str
 
 
+class SignUpStatusSchema(Schema):
+    status: str
+    contract_address: Optional[str]
+
+
+class WalletLookupSchema(Schema):
+    signers: list[str] = []
+    emails: list[str] = []
+    helpers: list[str] = []
+    contract_addresses: list[str] = []
+
+    @model_validator(mode="after")
+    def check_size(self):
+        if len(self.signers) + len(self.emails) + len(self.helpers) + len(self.contract_addresses) > MAX_LOOKUP_KEYS:
+            raise ValueError(f"At most {MAX_LOOKUP_KEYS} keys can be looked up at once")
+        return self
+
+
+class WalletLookupResultSchema(Schema):
+    field: str
+    value: str
+    source: Optional[str] = None
+    signer: Optional[str] = None
+    recovery_signer: Optional[str] = None
+    contract_address: Optional[str] = None
+    helper: Optional[str] = None
+    status: Optional[str] = None
+
+
+class BalanceSchema(Schema):
+    address: str
+    # decimal string of the raw balance, null when the call failed
+    balance: Optional[str]
+
+
+class BalanceSnapshotSchema(Schema):
+    id: int
+    token: str
+    block_number: int
+    block_hash: str
+    created_at: datetime
+    count: int
+    failed: int
+    offset: int
+    limit: int
+    balances: list[BalanceSchema]
+
+
+class RelayerSchema(Schema):
+    address: str
+    # sends of this process between nonce allocation and broadcast
+    in_flight: int
+    # transactions sent but not mined yet
+    pending: int
+    low_balance: bool
+
+
 class ExecuteSchema(Schema):
     dest: str
     value: int
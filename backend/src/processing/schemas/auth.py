@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Optional, Type
 
 from ninja import Schema
 from pydantic import EmailStr
@@ -7,8 +7,9 @@ from pydantic import EmailStr
 class AccountSchema(Schema):
     signer: str
     recovery_signer: str
-    contract_address: str
+    contract_address: Optional[str]
     helper: str
+    status: str
 
 
 class SignUpSchema(Schema):
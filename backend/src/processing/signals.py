@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from processing.models import Account
+from processing.wallets import LOOKUP_FIELDS, wallets
+
+
+def _remember_lookup_values(instance: Account) -> None:
+    instance._wallet_values = {field: instance.__dict__.get(field) for field in LOOKUP_FIELDS}
+
+
+@receiver(post_init, sender=Account)
+def account_loaded(sender, instance: Account, **kwargs):
+    _remember_lookup_values(instance)
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def account_changed(sender, instance: Account, **kwargs):
+    wallets.invalidate(instance)
+    _remember_lookup_values(instance)
@@ -0,0 +1,105 @@
+import logging
+from typing import Iterable, Optional
+
+from cache import aredis, redis
+from cache.provider import AsyncRedisOverride, RedisOverride
+from processing.models import Account
+from processing.schemas.auth import AccountSchema
+
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_FIELDS = ("signer", "helper", "email", "contract_address")
+ADDRESS_FIELDS = ("signer", "contract_address")
+# stored for keys without an account, so repeated 404s do not reach the database
+NOT_FOUND = ""
+
+
+class WalletCache:
+    """
+    Read-through cache of serialized AccountSchema payloads keyed by signer, helper and email.
+    Entries are dropped on Account save/delete and by the indexer, which updates rows in bulk.
+    """
+
+    def __init__(
+        self,
+        cache: RedisOverride = redis,
+        async_cache: AsyncRedisOverride = aredis,
+        ttl: int = 300,
+        negative_ttl: int = 30,
+    ):
+        self._cache = cache
+        self._async_cache = async_cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    @staticmethod
+    def normalize(field: str, value: str) -> str:
+        return value.lower() if field in ADDRESS_FIELDS else value
+
+    def key(self, field: str, value: str) -> str:
+        return f"wallet:{field}:{self.normalize(field, value)}"
+
+    def keys(self, accounts: Iterable[Account]) -> set[str]:
+        keys = set()
+        for account in accounts:
+            # values the row had when loaded, so a changed signer does not keep serving the old entry
+            loaded = getattr(account, "_wallet_values", {})
+            for field in LOOKUP_FIELDS:
+                for value in (account.__dict__.get(field), loaded.get(field)):
+                    if value:
+                        keys.add(self.key(field, value))
+        return keys
+
+    async def get(self, field: str, value: str) -> Optional[dict]:
+        key = self.key(field, value)
+        payload = await self._async_cache.get(key)
+        if payload is not None:
+            return payload or None
+
+        try:
+            account = await Account.objects.aget(**{field: value})
+        except Account.DoesNotExist:
+            await self._async_cache.set(key, NOT_FOUND, ex=self.negative_ttl)
+            return None
+        payload = AccountSchema.from_orm(account).dict()
+        await self._async_cache.set(key, payload, ex=self.ttl)
+        return payload
+
+    async def get_many(self, field: str, values: Iterable[str]) -> dict[str, Optional[dict]]:
+        """
+        Resolves many values of one field with a single MGET and a single IN query for the misses,
+        keyed by the normalized value
+        """
+        values = list(dict.fromkeys(self.normalize(field, value) for value in values))
+        if not values:
+            return {}
+        cached = await self._async_cache.mget(*(self.key(field, value) for value in values))
+        result = {value: payload or None for value, payload in zip(values, cached) if payload is not None}
+
+        misses = [value for value in values if value not in result]
+        if misses:
+            found = {}
+            async for account in Account.objects.filter(**{f"{field}__in": misses}):
+                found[self.normalize(field, getattr(account, field))] = AccountSchema.from_orm(account).dict()
+            if found:
+                await self._async_cache.mset(
+                    {self.key(field, value): payload for value, payload in found.items()}, ex=self.ttl
+                )
+            if missing := [value for value in misses if value not in found]:
+                await self._async_cache.mset(
+                    {self.key(field, value): NOT_FOUND for value in missing}, ex=self.negative_ttl
+                )
+            result.update((value, found.get(value)) for value in misses)
+        return result
+
+    def invalidate(self, *accounts: Account) -> None:
+        if keys := self.keys(accounts):
+            self._cache.delete(*keys)
+
+    async def ainvalidate(self, *accounts: Account) -> None:
+        if keys := self.keys(accounts):
+            await self._async_cache.delete(*keys)
+
+
+wallets = WalletCache()
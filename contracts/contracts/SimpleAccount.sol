@@ -36,6 +36,8 @@ contract SimpleAccount is UUPSUpgradeable, Initializable {
     address public signer;
     address public recovery_signer;
 
+    event SignerChanged(address indexed previousSigner, address indexed newSigner);
+
     constructor() {
         _disableInitializers();
     }
@@ -56,6 +58,7 @@ contract SimpleAccount is UUPSUpgradeable, Initializable {
 
     function changeSigner(address _new_signer, bytes calldata signature) external {
         require(recoverSigner(keccak256(abi.encodePacked(_new_signer)), signature) == recovery_signer, "invalid signature");
+        emit SignerChanged(signer, _new_signer);
         signer = _new_signer;
     }
 
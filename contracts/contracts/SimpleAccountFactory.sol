@@ -49,6 +49,17 @@ contract SimpleAccountFactory {
         return simple_account;
     }
     
+    function createAccounts(
+        address[] calldata _signers,
+        address[] calldata _recovery_signers
+    ) external returns (SimpleAccount[] memory accounts) {
+        require(_signers.length == _recovery_signers.length, "length mismatch");
+        accounts = new SimpleAccount[](_signers.length);
+        for (uint256 i = 0; i < _signers.length; i++) {
+            accounts[i] = createAccount(_signers[i], _recovery_signers[i]);
+        }
+    }
+
     function getUserByContract(address _contract) public view returns (UserContract memory) {
         return contracts[contracts_ids[_contract]];
     }
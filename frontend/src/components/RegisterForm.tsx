@@ -31,7 +31,18 @@ const RegisterForm: React.FC = () => {
                 helper: biometricData.faceHelper,
             });
 
-            const contractAddress = response.data.contract_address;
+            let account = response.data;
+            while (account.status === 'pending') {
+                const statusResponse = await axios.get(
+                    apiUrl + '/api/account/sign-up-status/' + email, {params: {wait: 25}}
+                );
+                account = statusResponse.data;
+            }
+            if (account.status === 'failed') {
+                throw new Error('Smart contract deployment failed');
+            }
+
+            const contractAddress = account.contract_address;
             setWalletData(biometricData.key1, contractAddress);
             navigate('/transactions');
 